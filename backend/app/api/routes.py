@@ -140,7 +140,7 @@ async def chat_stream(request: ChatRequest, db: AsyncSession = Depends(get_db)):
     )
     
     async def generate():
-        full_response = ""
+        response_parts = []
         try:
             yield f"data: {json.dumps({
                 'type': 'conversation_id', 
@@ -154,9 +154,10 @@ async def chat_stream(request: ChatRequest, db: AsyncSession = Depends(get_db)):
             
             async for chunk in agent.chat_stream(request.message, db=db):
                 if chunk.get("type") == "content":
-                    full_response += chunk.get("content", "")
+                    response_parts.append(chunk.get("content", ""))
                 yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
             
+            full_response = "".join(response_parts)
             assistant_message = Message(
                 conversation_id=conversation.id,
                 role="assistant",
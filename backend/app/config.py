@@ -90,6 +90,10 @@ class Settings(BaseSettings):
     MODEL_DEVICE: str = "auto"
     MODEL_FORCE_CPU: bool = False
     
+    # Skill 语义匹配配置（语义缓存 + LLM 不可用时的向量兜底匹配）
+    SKILL_EMBEDDING_ENABLED: bool = False
+    SKILL_EMBEDDING_PRECISION: str = "float32"
+    
     LANGSMITH_API_KEY: Optional[str] = None
     LANGSMITH_PROJECT: str = "self-bot"
     LANGSMITH_TRACING: bool = False
@@ -5,9 +5,26 @@ Token计数器
 """
 from typing import List, Optional
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+_ENCODE_THREADS = min(8, os.cpu_count() or 1)
+# encode_batch 每次调用都会新建一个 ThreadPoolExecutor，文本太少时开销大于并行收益
+_BATCH_ENCODE_MIN_TEXTS = 16
+
+
+def encode_lengths(encoder, texts: List[str]) -> List[int]:
+    """
+    用 tiktoken 编码器批量计算 token 数量
+    
+    文本较多且有多个 CPU 时用 encode_batch 并行编码，否则逐条 encode
+    """
+    if len(texts) < _BATCH_ENCODE_MIN_TEXTS or _ENCODE_THREADS == 1:
+        return [len(encoder.encode(text)) if text else 0 for text in texts]
+    encoded = encoder.encode_batch(list(texts), num_threads=_ENCODE_THREADS)
+    return [len(tokens) for tokens in encoded]
+
 
 class TokenCounter:
     """
@@ -79,7 +96,15 @@ class TokenCounter:
         Returns:
             Token数量列表
         """
-        return [self.count_tokens(text) for text in texts]
+        if not texts:
+            return []
+        
+        encoder = self._get_encoder()
+        
+        if encoder is not None:
+            return encode_lengths(encoder, texts)
+        
+        return [len(text) // 4 if text else 0 for text in texts]
     
     def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
         """
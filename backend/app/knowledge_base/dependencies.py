@@ -14,6 +14,7 @@ from app.knowledge_base.services.document import DocumentService
 from app.knowledge_base.services.knowledge_base import KnowledgeBaseService
 from app.knowledge_base.services.search import SearchService
 from app.knowledge_base.services.permission import PermissionService
+from app.knowledge_base.parsers import ParserRouter
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class ServiceContainer:
     def __init__(self):
         self._vector_store: Optional[VectorStoreBackend] = None
         self._embedding_service: Optional[EmbeddingService] = None
+        self._parser_router: Optional[ParserRouter] = None
         self._bm25_indexes: dict = {}
     
     @classmethod
@@ -49,6 +51,13 @@ class ServiceContainer:
             logger.info("EmbeddingService instance created")
         return self._embedding_service
     
+    @property
+    def parser_router(self) -> ParserRouter:
+        if self._parser_router is None:
+            self._parser_router = ParserRouter()
+            logger.info("ParserRouter instance created")
+        return self._parser_router
+    
     def get_bm25_index(self, kb_id: str) -> BM25Index:
         if kb_id not in self._bm25_indexes:
             config = BM25Config(k1=1.5, b=0.75, epsilon=0.25)
@@ -68,6 +77,7 @@ class ServiceContainer:
     def clear_all(self) -> None:
         self._vector_store = None
         self._embedding_service = None
+        self._parser_router = None
         self._bm25_indexes = {}
         logger.info("All service instances cleared")
 
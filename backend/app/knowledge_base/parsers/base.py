@@ -4,6 +4,8 @@ from pydantic import BaseModel, Field, ConfigDict
 from pathlib import Path
 import logging
 
+from app.core.token_counter import encode_lengths
+
 logger = logging.getLogger(__name__)
 
 
@@ -108,8 +110,20 @@ class TokenCounter:
         return max(estimated, 1)
     
     def count_tokens_batch(self, texts: List[str], model: str = "default") -> List[int]:
-        """批量计算 token 数量"""
-        return [self.count_tokens(text, model) for text in texts]
+        """
+        批量计算 token 数量
+        
+        编码策略见 app.core.token_counter.encode_lengths
+        """
+        if not texts:
+            return []
+        
+        encoder = self.get_encoder(model)
+        
+        if encoder is not None:
+            return encode_lengths(encoder, texts)
+        
+        return [self._estimate_tokens(text) if text else 0 for text in texts]
 
 
 _token_counter = TokenCounter()
@@ -137,6 +151,10 @@ class DocumentParser(ABC):
         """
         return self._token_counter.count_tokens(text, self.token_model)
     
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """批量计算一组分块的 token 数量"""
+        return self._token_counter.count_tokens_batch(texts, self.token_model)
+    
     def chunk_text(
         self,
         text: str,
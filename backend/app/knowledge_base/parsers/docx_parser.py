@@ -110,10 +110,11 @@ class DocxParser(DocumentParser):
                     ))
                 else:
                     text_chunks = self.chunk_text(section_content, chunk_size, overlap)
-                    for i, chunk in enumerate(text_chunks):
+                    token_counts = self.count_tokens_batch(text_chunks)
+                    for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                         chunks.append(ChunkResult(
                             content=chunk,
-                            token_count=self.count_tokens(chunk),
+                            token_count=token_count,
                             section_title=section['title'],
                             chunk_metadata={
                                 'level': section['level'],
@@ -122,10 +123,11 @@ class DocxParser(DocumentParser):
                         ))
         else:
             text_chunks = self.chunk_text(parsed_doc.content, chunk_size, overlap)
-            for i, chunk in enumerate(text_chunks):
+            token_counts = self.count_tokens_batch(text_chunks)
+            for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                 chunks.append(ChunkResult(
                     content=chunk,
-                    token_count=self.count_tokens(chunk),
+                    token_count=token_count,
                     chunk_metadata={'chunk_index': i},
                 ))
         
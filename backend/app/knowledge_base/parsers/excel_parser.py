@@ -98,10 +98,11 @@ class ExcelParser(DocumentParser):
                     ))
                 else:
                     text_chunks = self.chunk_text(table_text, chunk_size, 100)
-                    for i, chunk in enumerate(text_chunks):
+                    token_counts = self.count_tokens_batch(text_chunks)
+                    for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                         chunks.append(ChunkResult(
                             content=chunk,
-                            token_count=self.count_tokens(chunk),
+                            token_count=token_count,
                             metadata={
                                 'sheet_name': table['sheet_name'],
                                 'is_table': True,
@@ -110,10 +111,11 @@ class ExcelParser(DocumentParser):
                         ))
         else:
             text_chunks = self.chunk_text(parsed_doc.content, chunk_size)
-            for i, chunk in enumerate(text_chunks):
+            token_counts = self.count_tokens_batch(text_chunks)
+            for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                 chunks.append(ChunkResult(
                     content=chunk,
-                    token_count=self.count_tokens(chunk),
+                    token_count=token_count,
                     metadata={'chunk_index': i},
                 ))
         
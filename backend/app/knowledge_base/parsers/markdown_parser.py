@@ -111,10 +111,11 @@ class MarkdownParser(DocumentParser):
                     ))
                 else:
                     text_chunks = self.chunk_text(section_content, chunk_size, overlap)
-                    for i, chunk in enumerate(text_chunks):
+                    token_counts = self.count_tokens_batch(text_chunks)
+                    for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                         chunks.append(ChunkResult(
                             content=chunk,
-                            token_count=self.count_tokens(chunk),
+                            token_count=token_count,
                             section_title=section['title'],
                             metadata={
                                 'level': section['level'],
@@ -123,10 +124,11 @@ class MarkdownParser(DocumentParser):
                         ))
         else:
             text_chunks = self.chunk_text(parsed_doc.content, chunk_size, overlap)
-            for i, chunk in enumerate(text_chunks):
+            token_counts = self.count_tokens_batch(text_chunks)
+            for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                 chunks.append(ChunkResult(
                     content=chunk,
-                    token_count=self.count_tokens(chunk),
+                    token_count=token_count,
                     metadata={'chunk_index': i},
                 ))
         
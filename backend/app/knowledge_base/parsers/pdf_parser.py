@@ -12,19 +12,35 @@ PDF解析器模块
 根据文档特征自动选择最佳解析器
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union, BinaryIO
 from pathlib import Path
 from dataclasses import dataclass, field
+from collections import OrderedDict
 import asyncio
+import copy
+import functools
+import importlib.util
+import io
 import logging
 import json
 import tempfile
+import threading
 import os
 
 from .base import DocumentParser, ParsedDocument, ChunkResult
 
 logger = logging.getLogger(__name__)
 
+_FEATURE_CACHE_SIZE = 128
+_FEATURE_CACHE: "OrderedDict[Tuple[str, int, int, Optional[int]], DocumentFeatures]" = OrderedDict()
+_FEATURE_CACHE_LOCK = threading.Lock()
+
+
+@functools.cache
+def _module_available(module_name: str) -> bool:
+    """通过 find_spec 判断模块是否已安装，不执行模块代码，结果在进程内缓存"""
+    return importlib.util.find_spec(module_name) is not None
+
 
 @dataclass
 class DocumentFeatures:
@@ -141,6 +157,35 @@ class PDFFeatureAnalyzer:
     ]
     
     def analyze(self, file_path: str, sample_pages: int = None) -> DocumentFeatures:
+        """
+        分析文档特征
+        
+        结果按 (路径, mtime_ns, 文件大小, 采样页数) 在模块级缓存，
+        文件未变化时不再重复打开PDF
+        """
+        stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, sample_pages)
+        
+        with _FEATURE_CACHE_LOCK:
+            cached = _FEATURE_CACHE.get(cache_key)
+            if cached is not None:
+                _FEATURE_CACHE.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+        
+        features = self._analyze(file_path, sample_pages)
+        
+        with _FEATURE_CACHE_LOCK:
+            _FEATURE_CACHE[cache_key] = copy.deepcopy(features)
+            if len(_FEATURE_CACHE) > _FEATURE_CACHE_SIZE:
+                _FEATURE_CACHE.popitem(last=False)
+        
+        return features
+    
+    def clear_cache(self):
+        with _FEATURE_CACHE_LOCK:
+            _FEATURE_CACHE.clear()
+    
+    def _analyze(self, file_path: str, sample_pages: int = None) -> DocumentFeatures:
         import time
         start_time = time.time()
         
@@ -149,9 +194,12 @@ class PDFFeatureAnalyzer:
         except ImportError:
             raise ImportError("PyMuPDF not installed. Run: pip install PyMuPDF")
         
-        doc = fitz.open(file_path)
+        # 一次顺序读入内存，PyMuPDF 和 pdfplumber 都从同一份字节解析，
+        # 避免两次打开文件产生大量小块随机读
+        data = Path(file_path).read_bytes()
+        doc = fitz.open(stream=data, filetype="pdf")
         page_count = len(doc)
-        file_size = os.path.getsize(file_path)
+        file_size = len(data)
         
         if sample_pages is None:
             sample_pages = self._calculate_sample_pages(page_count)
@@ -220,7 +268,7 @@ class PDFFeatureAnalyzer:
         )
         
         features.has_tables, features.table_count, features.table_ratio = self._detect_tables_enhanced(
-            file_path, page_count, sample_indices
+            io.BytesIO(data), page_count, sample_indices
         )
         
         features.has_formulas = formula_pages > 0
@@ -361,7 +409,7 @@ class PDFFeatureAnalyzer:
     
     def _detect_tables_enhanced(
         self, 
-        file_path: str, 
+        file_path: Union[str, BinaryIO], 
         page_count: int,
         sample_indices: List[int]
     ) -> Tuple[bool, int, float]:
@@ -736,11 +784,7 @@ class OCRParser:
         self._layout_engine = None
     
     def _check_installation(self) -> bool:
-        try:
-            import paddleocr
-            return True
-        except ImportError:
-            return False
+        return _module_available("paddleocr")
     
     def _get_ocr(self):
         if self._ocr is None:
@@ -1345,11 +1389,7 @@ class DoclingParser:
         self._converter = None
     
     def _check_installation(self) -> bool:
-        try:
-            import docling
-            return True
-        except ImportError:
-            return False
+        return _module_available("docling")
     
     def _get_converter(self):
         if self._converter is None:
@@ -1960,11 +2000,7 @@ class MinerUParser:
         self._mineru = None
     
     def _check_installation(self):
-        try:
-            import magic_pdf
-            return True
-        except ImportError:
-            return False
+        return _module_available("magic_pdf")
     
     def parse(self, file_path: str) -> ParsedDocument:
         if not self._check_installation():
@@ -2334,6 +2370,14 @@ class PDFParser(DocumentParser):
         "mineru": "MinerU深度解析（版面分析+表格识别+公式识别）",
     }
     
+    PARSER_MODULES = {
+        "pymupdf": "fitz",
+        "pdfplumber": "pdfplumber",
+        "ocr": "paddleocr",
+        "docling": "docling",
+        "mineru": "magic_pdf",
+    }
+    
     def __init__(
         self,
         parser_type: str = "auto",
@@ -2350,6 +2394,12 @@ class PDFParser(DocumentParser):
         self._parsers = {}
         self._analyzer = PDFFeatureAnalyzer()
     
+    @classmethod
+    def is_available(cls, parser_type: str) -> bool:
+        """检查解析器依赖是否已安装，无需构造解析器或导入重量级依赖"""
+        module_name = cls.PARSER_MODULES.get(parser_type)
+        return module_name is not None and _module_available(module_name)
+    
     def _get_parser(self, parser_type: str):
         if parser_type not in self._parsers:
             if parser_type == "pymupdf":
@@ -2370,6 +2420,8 @@ class PDFParser(DocumentParser):
     async def parse(self, file_path: str) -> ParsedDocument:
         loop = asyncio.get_event_loop()
         
+        self._validate_pdf(file_path)
+        
         parser_type = self.parser_type
         features = None
         
@@ -2422,6 +2474,9 @@ class PDFParser(DocumentParser):
             for fallback_type in fallback_order:
                 if fallback_type == parser_type:
                     continue
+                if not self.is_available(fallback_type):
+                    logger.debug(f"Fallback {fallback_type} not installed, skipping")
+                    continue
                 try:
                     parser = self._get_parser(fallback_type)
                     result = await loop.run_in_executor(None, parser.parse, file_path)
@@ -2441,6 +2496,21 @@ class PDFParser(DocumentParser):
                 f"Install at least one: pip install PyMuPDF pdfplumber paddleocr mineru[all] docling"
             )
     
+    @staticmethod
+    def _validate_pdf(file_path: str):
+        """
+        快速校验文件是否为PDF，空文件或缺少 %PDF- 文件头时直接失败，
+        避免逐个解析器打开损坏文件再走回退链
+        """
+        if os.path.getsize(file_path) == 0:
+            raise ValueError(f"Empty PDF file: {file_path}")
+        
+        with open(file_path, 'rb') as f:
+            header = f.read(1024)
+        
+        if b'%PDF-' not in header:
+            raise ValueError(f"Not a valid PDF file (missing %PDF- header): {file_path}")
+    
     def supported_extensions(self) -> List[str]:
         return ['.pdf']
     
@@ -2598,11 +2668,8 @@ class PDFParser(DocumentParser):
             raise NotImplementedError(f"Parser {parser_type} does not support HTML export")
     
     def get_available_parsers(self) -> Dict[str, str]:
-        available = {}
-        for parser_type, desc in self.PARSER_TYPES.items():
-            try:
-                self._get_parser(parser_type)
-                available[parser_type] = desc
-            except ImportError:
-                pass
-        return available
+        return {
+            parser_type: desc
+            for parser_type, desc in self.PARSER_TYPES.items()
+            if self.is_available(parser_type)
+        }
@@ -73,10 +73,11 @@ class PPTXParser(DocumentParser):
         
         if not parsed_doc.pages:
             text_chunks = self.chunk_text(parsed_doc.content, chunk_size)
-            for i, chunk in enumerate(text_chunks):
+            token_counts = self.count_tokens_batch(text_chunks)
+            for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                 chunks.append(ChunkResult(
                     content=chunk,
-                    token_count=self.count_tokens(chunk),
+                    token_count=token_count,
                     metadata={'chunk_index': i},
                 ))
             return chunks
@@ -108,12 +108,10 @@ class ParserRouter:
         return is_complex
     
     def _check_docling_available(self) -> bool:
-        try:
-            import docling
+        if PDFParser.is_available("docling"):
             return True
-        except ImportError:
-            logger.warning("Docling not available for fallback. Install with: pip install docling")
-            return False
+        logger.warning("Docling not available for fallback. Install with: pip install docling")
+        return False
     
     def get_parser_by_type(self, file_type: str) -> Optional[DocumentParser]:
         type_mapping = {
@@ -62,10 +62,11 @@ class TXTParser(DocumentParser):
                 
                 if len(para) > chunk_size:
                     text_chunks = self.chunk_text(para, chunk_size, overlap)
-                    for i, chunk in enumerate(text_chunks):
+                    token_counts = self.count_tokens_batch(text_chunks)
+                    for i, (chunk, token_count) in enumerate(zip(text_chunks, token_counts)):
                         chunks.append(ChunkResult(
                             content=chunk,
-                            token_count=self.count_tokens(chunk),
+                            token_count=token_count,
                             metadata={'chunk_index': i, 'long_paragraph': True},
                         ))
                     current_chunk = ""
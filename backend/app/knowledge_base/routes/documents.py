@@ -23,7 +23,6 @@ from app.knowledge_base.dependencies import (
     get_embedding_service,
     ServiceContainer,
 )
-from app.knowledge_base.parsers import ParserRouter
 
 router = APIRouter(prefix="/documents", tags=["文档"])
 
@@ -64,7 +63,7 @@ async def process_document(
             await doc_service.update_status(doc_id, DocumentStatus.PROCESSING)
             
             logger.info(f"开始解析文档: {file_path}")
-            parser_router = ParserRouter()
+            parser_router = container.parser_router
             chunks = await parser_router.parse_and_chunk(file_path)
             logger.info(f"文档解析完成，共 {len(chunks)} 个分块")
             
@@ -105,7 +104,7 @@ async def process_document(
                 vector_store=vector_store,
                 embedding_service=embedding_service,
             )
-            search_service.build_bm25_index(kb_id, bm25_documents)
+            await search_service.build_bm25_index_async(kb_id, bm25_documents)
             logger.info(f"BM25 索引构建完成")
             
             kb_service = KnowledgeBaseService(session, vector_store)
@@ -159,7 +158,7 @@ async def upload_document(
     logger.info(f"Uploading file: {file.filename}, extension: {file_ext}")
     
     try:
-        parser_router = ParserRouter()
+        parser_router = ServiceContainer.get_instance().parser_router
         supported_exts = parser_router.supported_extensions()
         logger.info(f"Supported extensions: {supported_exts}")
         
@@ -2,22 +2,61 @@
 BM25 检索器实现
 用于关键词检索，与向量检索配合实现混合检索
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass, field, asdict
 import asyncio
+import heapq
 import logging
 import re
 import math
 import json
 import os
+from array import array
 from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 
 import jieba
 import jieba.analyse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_PUNCTUATION_RE = re.compile(r'^[^\w\s]+$')
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _tokenize_text(text: str) -> List[str]:
+    """
+    分词函数
+    使用 jieba 进行中文分词，支持中英文混合文本
+    """
+    tokens = []
+    for token in jieba.cut(text.lower(), cut_all=False):
+        token = token.strip()
+        if token and not _PUNCTUATION_RE.match(token):
+            tokens.append(token)
+    
+    return tokens
+
+
+@lru_cache(maxsize=1024)
+def _tokenize_query(query: str) -> Tuple[str, ...]:
+    """查询分词结果与索引内容无关，重复的查询直接复用"""
+    return tuple(_tokenize_text(query))
+
 
 @dataclass
 class BM25Document:
@@ -48,31 +87,23 @@ class BM25Index:
     def __init__(self, config: Optional[BM25Config] = None, persist_path: Optional[str] = None):
         self.config = config or BM25Config()
         self.documents: Dict[str, BM25Document] = {}
-        self.doc_freqs: Dict[str, int] = {}
+        self.doc_freqs: Counter = Counter()
         self.doc_len: Dict[str, int] = {}
         self.avgdl: float = 0
         self.n_docs: int = 0
         self._idf_cache: Dict[str, float] = {}
+        self._doc_tf: Dict[str, Counter] = {}
+        self._doc_ids: List[str] = []
+        self._postings: Dict[str, Tuple[array, array, array]] = {}
+        self._stats_dirty: bool = True
         self.persist_path = persist_path
         
         if persist_path and os.path.exists(persist_path):
             self._load_from_disk()
     
     def _tokenize(self, text: str) -> List[str]:
-        """
-        分词函数
-        使用 jieba 进行中文分词，支持中英文混合文本
-        """
-        text = text.lower()
-        
-        tokens = list(jieba.cut(text, cut_all=False))
-        
-        tokens = [t.strip() for t in tokens if t.strip() and len(t.strip()) > 0]
-        
-        punctuation_pattern = r'^[^\w\s]+$'
-        tokens = [t for t in tokens if not re.match(punctuation_pattern, t)]
-        
-        return tokens
+        """分词函数"""
+        return _tokenize_text(text)
     
     def _compute_idf(self, word: str) -> float:
         """计算 IDF 值"""
@@ -88,29 +119,83 @@ class BM25Index:
         self._idf_cache[word] = idf
         return idf
     
-    def _score_document(self, query_tokens: List[str], doc: BM25Document) -> float:
-        """计算文档与查询的 BM25 分数"""
-        score = 0.0
-        doc_tokens = doc.tokens
-        doc_len = len(doc_tokens)
+    def _ensure_stats(self) -> None:
+        """
+        按需重建与查询无关的统计量
         
-        tf = Counter(doc_tokens)
+        文档按插入顺序编号为连续整数，倒排表 term -> (编号, tf * (k1 + 1), tf + 长度归一化项)
+        三个并列的 array，直接存放与查询无关的分子分母，比逐条 tuple 紧凑得多；
+        长度归一化项 k1 * (1 - b + b * dl / avgdl) 只在索引变更后计算一次，
+        查询时只遍历包含查询词的文档，也不再按文档 id 查表
+        """
+        if not self._stats_dirty:
+            return
+        
+        k1 = self.config.k1
+        b = self.config.b
+        k1_plus_1 = k1 + 1
+        
+        doc_ids = list(self.documents)
+        postings: Dict[str, Tuple[array, array, array]] = {}
+        
+        for idx, doc_id in enumerate(doc_ids):
+            doc = self.documents[doc_id]
+            doc_tf = self._doc_tf.get(doc_id)
+            if doc_tf is None:
+                doc_tf = self._doc_tf[doc_id] = Counter(doc.tokens)
+            
+            # avgdl 为 0 时所有文档都没有词项，归一化项不会参与打分
+            if self.avgdl:
+                len_norm = k1 * (1 - b + b * len(doc.tokens) / self.avgdl)
+            else:
+                len_norm = k1 * (1 - b)
+            
+            for term, term_freq in doc_tf.items():
+                posting = postings.get(term)
+                if posting is None:
+                    posting = postings[term] = (array('l'), array('d'), array('d'))
+                posting[0].append(idx)
+                posting[1].append(term_freq * k1_plus_1)
+                posting[2].append(term_freq + len_norm)
+        
+        self._doc_ids = doc_ids
+        self._postings = postings
+        
+        self._stats_dirty = False
+    
+    def _score_query(self, query_tokens: Sequence[str]) -> Dict[int, float]:
+        """
+        通过倒排表计算所有命中文档的 BM25 分数
+        
+        返回 文档编号 -> 分数，编号对应 self._doc_ids；未命中任何查询词的文档不出现在结果中
+        """
+        self._ensure_stats()
+        
+        scores: Dict[int, float] = {}
+        get_score = scores.get
         
         for term in query_tokens:
-            if term not in tf:
+            postings = self._postings.get(term)
+            if not postings:
                 continue
             
             idf = self._compute_idf(term)
-            term_freq = tf[term]
             
-            numerator = term_freq * (self.config.k1 + 1)
-            denominator = term_freq + self.config.k1 * (
-                1 - self.config.b + self.config.b * doc_len / self.avgdl
-            )
-            
-            score += idf * numerator / denominator
+            for idx, numerator, denominator in zip(*postings):
+                scores[idx] = get_score(idx, 0.0) + idf * numerator / denominator
         
-        return score
+        return scores
+    
+    def tokenize_documents(self, documents: List[BM25Document]) -> None:
+        """
+        预先为文档分词
+        
+        只写入各文档自身的 tokens，不修改索引状态，
+        可以放到线程池中执行；add_documents 会跳过已分词的文档
+        """
+        for doc in documents:
+            if not doc.tokens:
+                doc.tokens = self._tokenize(doc.content)
     
     def add_documents(self, documents: List[BM25Document]) -> None:
         """添加文档到索引"""
@@ -118,13 +203,12 @@ class BM25Index:
             if doc.id in self.documents:
                 continue
             
-            doc.tokens = self._tokenize(doc.content)
+            if not doc.tokens:
+                doc.tokens = self._tokenize(doc.content)
             self.documents[doc.id] = doc
             self.doc_len[doc.id] = len(doc.tokens)
             
-            term_set = set(doc.tokens)
-            for term in term_set:
-                self.doc_freqs[term] = self.doc_freqs.get(term, 0) + 1
+            self.doc_freqs.update(set(doc.tokens))
             
             self.n_docs += 1
         
@@ -132,6 +216,7 @@ class BM25Index:
             self.avgdl = sum(self.doc_len.values()) / self.n_docs
         
         self._idf_cache.clear()
+        self._stats_dirty = True
         
         logger.info(f"BM25 index updated: {self.n_docs} documents, avg length: {self.avgdl:.2f}")
         
@@ -153,6 +238,7 @@ class BM25Index:
             
             del self.documents[doc_id]
             del self.doc_len[doc_id]
+            self._doc_tf.pop(doc_id, None)
             self.n_docs -= 1
         
         if self.n_docs > 0:
@@ -161,6 +247,7 @@ class BM25Index:
             self.avgdl = 0
         
         self._idf_cache.clear()
+        self._stats_dirty = True
         
         self.save_to_disk()
     
@@ -184,19 +271,35 @@ class BM25Index:
         if not self.documents:
             return []
         
-        query_tokens = self._tokenize(query)
+        query_tokens = _tokenize_query(query)
         if not query_tokens:
             return []
         
-        scores = []
-        for doc_id, doc in self.documents.items():
-            score = self._score_document(query_tokens, doc)
-            if score >= min_score:
-                scores.append((doc, score))
+        doc_scores = self._score_query(query_tokens)
+        doc_ids = self._doc_ids
+        
+        # 编号即插入顺序，同分时按插入顺序排列
+        ranked = heapq.nsmallest(
+            top_k,
+            (
+                (idx, score)
+                for idx, score in doc_scores.items()
+                if score >= min_score
+            ),
+            key=lambda x: (-x[1], x[0]),
+        )
+        
+        results = [(self.documents[doc_ids[idx]], score) for idx, score in ranked]
+        
+        # 未命中的文档得分为 0，阈值允许时按插入顺序补足 top_k
+        if min_score <= 0.0 and len(results) < top_k:
+            for idx, doc_id in enumerate(doc_ids):
+                if len(results) >= top_k:
+                    break
+                if idx not in doc_scores:
+                    results.append((self.documents[doc_id], 0.0))
         
-        scores.sort(key=lambda x: x[1], reverse=True)
-        
-        return scores[:top_k]
+        return results
     
     def clear(self) -> None:
         """清空索引"""
@@ -204,6 +307,10 @@ class BM25Index:
         self.doc_freqs.clear()
         self.doc_len.clear()
         self._idf_cache.clear()
+        self._doc_tf.clear()
+        self._doc_ids = []
+        self._postings.clear()
+        self._stats_dirty = True
         self.n_docs = 0
         self.avgdl = 0
         
@@ -233,14 +340,19 @@ class BM25Index:
                     }
                     for doc_id, doc in self.documents.items()
                 },
-                'doc_freqs': self.doc_freqs,
+                'doc_freqs': dict(self.doc_freqs),
                 'doc_len': self.doc_len,
                 'avgdl': self.avgdl,
                 'n_docs': self.n_docs,
             }
             
-            with open(self.persist_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 紧凑格式可以走 json 的 C 编码器（indent 会退回纯 Python 实现），装了 orjson 时优先用它；
+            # 先写临时文件再原子替换，写入中断不会留下损坏的索引导致重建
+            payload = _dumps(data)
+            tmp_path = f"{self.persist_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.persist_path)
             
             logger.info(f"BM25 index saved to {self.persist_path}: {self.n_docs} documents")
         except Exception as e:
@@ -252,15 +364,15 @@ class BM25Index:
             return
         
         try:
-            with open(self.persist_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.persist_path, 'rb') as f:
+                data = _loads(f.read())
             
             self.config = BM25Config(**data.get('config', {}))
             self.documents = {
                 doc_id: BM25Document(**doc_data)
                 for doc_id, doc_data in data.get('documents', {}).items()
             }
-            self.doc_freqs = data.get('doc_freqs', {})
+            self.doc_freqs = Counter(data.get('doc_freqs', {}))
             self.doc_len = {k: int(v) for k, v in data.get('doc_len', {}).items()}
             self.avgdl = data.get('avgdl', 0)
             self.n_docs = data.get('n_docs', 0)
@@ -269,7 +381,7 @@ class BM25Index:
         except Exception as e:
             logger.error(f"Failed to load BM25 index: {e}")
             self.documents = {}
-            self.doc_freqs = {}
+            self.doc_freqs = Counter()
             self.doc_len = {}
             self.avgdl = 0
             self.n_docs = 0
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from collections import OrderedDict
 import asyncio
 import os
@@ -159,24 +159,30 @@ class EmbeddingService:
         if not texts:
             return []
         
-        uncached_texts = []
-        uncached_indices = []
         results = [None] * len(texts)
+        use_cache = self.cache_enabled and self._cache is not None
         
-        if self.cache_enabled and self._cache is not None:
-            for i, text in enumerate(texts):
+        # 同一批次中重复的文本（页眉、页脚、模板段落等）只编码一次
+        pending: Dict[str, List[int]] = {}
+        cache_keys: Dict[str, str] = {}
+        
+        for i, text in enumerate(texts):
+            if text in pending:
+                pending[text].append(i)
+                continue
+            
+            if use_cache:
                 cache_key = self._get_cache_key(text)
                 cached = self._cache.get(cache_key)
                 if cached is not None:
                     results[i] = cached
-                else:
-                    uncached_texts.append(text)
-                    uncached_indices.append(i)
-        else:
-            uncached_texts = texts
-            uncached_indices = list(range(len(texts)))
+                    continue
+                cache_keys[text] = cache_key
+            
+            pending[text] = [i]
         
-        if uncached_texts:
+        if pending:
+            uncached_texts = list(pending)
             loop = asyncio.get_event_loop()
             embeddings = await loop.run_in_executor(
                 None,
@@ -184,12 +190,12 @@ class EmbeddingService:
                 uncached_texts,
             )
             
-            for idx, embedding in zip(uncached_indices, embeddings):
-                results[idx] = embedding
+            for text, embedding in zip(uncached_texts, embeddings):
+                for idx in pending[text]:
+                    results[idx] = embedding
                 
-                if self.cache_enabled and self._cache is not None:
-                    cache_key = self._get_cache_key(texts[idx])
-                    self._cache.set(cache_key, embedding)
+                if use_cache:
+                    self._cache.set(cache_keys[text], embedding)
         
         return results
     
@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
 import asyncio
+import heapq
 import time
 import logging
 import os
@@ -157,10 +158,9 @@ class SearchService:
         
         if use_rerank and self.reranker:
             all_results = await self._rerank(query, all_results)
-        else:
-            all_results.sort(key=lambda x: x.score, reverse=True)
+            return all_results[:top_k]
         
-        return all_results[:top_k]
+        return heapq.nlargest(top_k, all_results, key=lambda x: x.score)
     
     async def _rerank(
         self,
@@ -329,10 +329,9 @@ class SearchService:
         
         if use_rerank and self.reranker:
             all_results = await self._rerank(query, all_results)
-        else:
-            all_results.sort(key=lambda x: x.score, reverse=True)
+            return all_results[:top_k]
         
-        return all_results[:top_k]
+        return heapq.nlargest(top_k, all_results, key=lambda x: x.score)
     
     async def _bm25_search(
         self,
@@ -397,7 +396,35 @@ class SearchService:
             kb_id: 知识库 ID
             documents: 文档列表，每个文档包含 id, content, metadata
         """
-        bm25_docs = [
+        bm25_docs = self._to_bm25_documents(documents)
+        
+        self._get_or_create_bm25_index(kb_id).add_documents(bm25_docs)
+        logger.info(f"BM25 index built for kb_id={kb_id}, docs={len(documents)}")
+    
+    async def build_bm25_index_async(
+        self,
+        kb_id: str,
+        documents: List[Dict[str, Any]],
+    ) -> None:
+        """
+        构建 BM25 索引（异步）
+        
+        jieba 分词是纯 Python 的 CPU 密集操作，放到线程池中执行以免阻塞事件循环；
+        分词只写入文档自身，索引的修改仍在事件循环线程中完成
+        """
+        bm25_docs = self._to_bm25_documents(documents)
+        index = self._get_or_create_bm25_index(kb_id)
+        
+        pending = [doc for doc in bm25_docs if doc.id not in index.documents]
+        if pending:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, index.tokenize_documents, pending)
+        
+        index.add_documents(bm25_docs)
+        logger.info(f"BM25 index built for kb_id={kb_id}, docs={len(documents)}")
+    
+    def _to_bm25_documents(self, documents: List[Dict[str, Any]]) -> List[BM25Document]:
+        return [
             BM25Document(
                 id=doc["id"],
                 content=doc["content"],
@@ -405,13 +432,13 @@ class SearchService:
             )
             for doc in documents
         ]
-        
+    
+    def _get_or_create_bm25_index(self, kb_id: str) -> BM25Index:
         if kb_id not in self._bm25_indexes:
             index_path = os.path.join(self.bm25_persist_path, f"bm25_{kb_id}.json")
             self._bm25_indexes[kb_id] = BM25Index(persist_path=index_path)
         
-        self._bm25_indexes[kb_id].add_documents(bm25_docs)
-        logger.info(f"BM25 index built for kb_id={kb_id}, docs={len(documents)}")
+        return self._bm25_indexes[kb_id]
     
     def update_bm25_index(
         self,
@@ -482,7 +509,7 @@ class SearchService:
                 for chunk in chunks
             ]
             
-            self.build_bm25_index(kb_id, documents)
+            await self.build_bm25_index_async(kb_id, documents)
             logger.info(f"BM25 index built for kb_id={kb_id}, chunks={len(chunks)}")
             return True
             
@@ -619,8 +646,7 @@ class SearchService:
                 )
             all_results.extend(results)
         
-        all_results.sort(key=lambda x: x.score, reverse=True)
-        all_results = all_results[:top_k * len(kb_ids)]
+        all_results = heapq.nlargest(top_k * len(kb_ids), all_results, key=lambda x: x.score)
         
         compressed_docs = await self._compressor.compress(
             query=query,
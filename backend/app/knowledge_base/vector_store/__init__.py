@@ -79,6 +79,8 @@ class VectorStoreBackend(ABC):
 
 class ChromaBackend(VectorStoreBackend):
     
+    DEFAULT_MAX_BATCH_SIZE = 5000
+    
     def __init__(self, persist_directory: str = None):
         self.persist_directory = persist_directory or settings.KB_VECTOR_PATH
         self._client = None
@@ -136,6 +138,8 @@ class ChromaBackend(VectorStoreBackend):
         documents: List[str],
     ) -> List[str]:
         client = await self._get_client()
+        collection = None
+        written = 0
         try:
             collection = await self._get_collection(collection_name)
             if collection is None:
@@ -145,17 +149,30 @@ class ChromaBackend(VectorStoreBackend):
                 )
                 self._collections[collection_name] = collection
             
-            collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                documents=documents,
-            )
+            batch_size = self._get_max_batch_size(client)
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                collection.add(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end],
+                    metadatas=metadatas[start:end],
+                    documents=documents[start:end],
+                )
+                written = min(end, len(ids))
             return ids
         except Exception as e:
             logger.error(f"Error inserting vectors: {e}")
+            if written:
+                self._rollback_insert(collection, ids[:written])
             return []
     
+    def _rollback_insert(self, collection, ids: List[str]):
+        """分批写入中途失败时删除已写入的批次，保证返回 [] 时没有残留向量"""
+        try:
+            collection.delete(ids=ids)
+        except Exception as e:
+            logger.error(f"Error rolling back {len(ids)} inserted vectors: {e}")
+    
     async def _get_collection(self, collection_name: str):
         if collection_name in self._collections:
             return self._collections[collection_name]
@@ -168,6 +185,13 @@ class ChromaBackend(VectorStoreBackend):
         except Exception:
             return None
     
+    def _get_max_batch_size(self, client) -> int:
+        """Chroma 单次写入有条数上限，超过时需要分批"""
+        try:
+            return max(1, int(client.get_max_batch_size()))
+        except Exception:
+            return self.DEFAULT_MAX_BATCH_SIZE
+    
     async def search(
         self,
         collection_name: str,
@@ -1,6 +1,7 @@
 from langchain_openai import ChatOpenAI
 from langchain_core.language_models import BaseChatModel
 from typing import Optional
+from functools import lru_cache
 from app.config import settings
 
 
@@ -12,6 +13,31 @@ def get_llm(
 ) -> BaseChatModel:
     provider = provider or settings.DEFAULT_LLM_PROVIDER
     
+    cache_key = tuple(sorted(kwargs.items()))
+    try:
+        hash(cache_key)
+    except TypeError:
+        return _create_llm(provider, model, temperature, **kwargs)
+    
+    return _get_cached_llm(provider, model, temperature, cache_key)
+
+
+@lru_cache(maxsize=32)
+def _get_cached_llm(
+    provider: str,
+    model: Optional[str],
+    temperature: float,
+    kwargs_items: tuple,
+) -> BaseChatModel:
+    return _create_llm(provider, model, temperature, **dict(kwargs_items))
+
+
+def _create_llm(
+    provider: str,
+    model: Optional[str],
+    temperature: float,
+    **kwargs,
+) -> BaseChatModel:
     configs = {
         "openai": {
             "model": model or settings.OPENAI_MODEL,
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from collections import Counter
 from datetime import datetime, timezone
 from pydantic import BaseModel
 import uuid
@@ -42,9 +43,11 @@ class LongTermMemory:
         self.vector_store = ChromaVectorStore(
             persist_directory=chroma_path or settings.AGENT_VECTOR_PATH,
         )
+        # 模型在第一次 embed / retrieve 时才加载，创建服务实例不必等待模型加载
         self.rag_config = RAGConfig(
             embedding_model=embedding_model,
             reranker_model=reranker_model,
+            require_embedding_model=False,
         )
         self.rag_retriever = RAGRetriever(
             self.vector_store,
@@ -283,10 +286,7 @@ class LongTermMemory:
     async def get_stats(self) -> dict:
         all_entries = await self.list_all()
         
-        by_importance = {}
-        for entry in all_entries:
-            level = entry.importance
-            by_importance[level] = by_importance.get(level, 0) + 1
+        by_importance = dict(Counter(entry.importance for entry in all_entries))
         
         return {
             "total_memories": len(all_entries),
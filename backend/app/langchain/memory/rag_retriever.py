@@ -3,6 +3,7 @@ from pydantic import BaseModel
 import asyncio
 import logging
 import os
+import threading
 
 from app.config import settings
 from app.core.device_utils import get_optimal_device, log_device_status
@@ -78,6 +79,7 @@ class RAGRetriever:
         self._embedding_model = None
         self._reranker = None
         self._embedding_dim: Optional[int] = None
+        self._model_lock = threading.Lock()
         
         if self.config.require_embedding_model:
             self._ensure_embedding_model()
@@ -120,17 +122,23 @@ class RAGRetriever:
                 f"Failed to load embedding model '{self.config.embedding_model}': {e}"
             ) from e
     
+    def _load_embedding_model_once(self) -> None:
+        """延迟加载时可能从多个线程池线程同时触发，加锁避免重复加载模型"""
+        with self._model_lock:
+            if self._embedding_model is None:
+                self._ensure_embedding_model()
+    
     @property
     def embedding_model(self):
         if self._embedding_model is None:
-            self._ensure_embedding_model()
+            self._load_embedding_model_once()
         return self._embedding_model
     
     @property
     def embedding_dim(self) -> int:
         """获取实际的 embedding 维度"""
         if self._embedding_dim is None:
-            self._ensure_embedding_model()
+            self._load_embedding_model_once()
         return self._embedding_dim
     
     @property
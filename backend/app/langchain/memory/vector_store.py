@@ -9,7 +9,6 @@ from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 from pathlib import Path
 import logging
-import math
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +26,15 @@ class InMemoryVectorStore:
     内存向量存储
     
     使用余弦相似度进行搜索，作为 ChromaDB 的 fallback 方案
+    向量按行归一化后存放在一个连续的 float32 矩阵中，搜索为一次矩阵向量乘
     """
     
     def __init__(self, embedding_dim: int = 768):
         self.embedding_dim = embedding_dim
         self._store: Dict[str, Dict[str, Any]] = {}
+        self._ids: List[str] = []
+        self._matrix = None
+        self._matrix_dirty = True
     
     async def insert(
         self,
@@ -39,6 +42,12 @@ class InMemoryVectorStore:
         embeddings: List[List[float]],
     ) -> List[str]:
         """插入文档"""
+        dim = self._stored_dim()
+        for emb in embeddings:
+            if dim is None:
+                dim = len(emb)
+            self._check_dim(emb, dim, "embedding")
+        
         ids = []
         for doc, emb in zip(documents, embeddings):
             doc.embedding = emb
@@ -47,8 +56,44 @@ class InMemoryVectorStore:
                 "embedding": emb,
             }
             ids.append(doc.id)
+        self._matrix_dirty = True
         return ids
     
+    def _stored_dim(self) -> Optional[int]:
+        """已存向量的维度，以实际写入的向量为准；存储为空时返回 None"""
+        for entry in self._store.values():
+            return len(entry["embedding"])
+        return None
+    
+    def _check_dim(self, vector, dim: int, name: str):
+        """所有向量拼成一个矩阵，维度不一致时给出明确的错误而不是 numpy 的形状错误"""
+        if len(vector) != dim:
+            raise ValueError(
+                f"{name} dimension {len(vector)} does not match "
+                f"stored vector dimension {dim}"
+            )
+    
+    def _ensure_matrix(self):
+        """写入或删除后重建归一化向量矩阵，连续搜索之间复用"""
+        if not self._matrix_dirty:
+            return self._matrix
+        
+        import numpy as np
+        
+        self._ids = list(self._store.keys())
+        matrix = np.asarray(
+            [self._store[doc_id]["embedding"] for doc_id in self._ids],
+            dtype=np.float32,
+        ).reshape(len(self._ids), -1)
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        
+        self._matrix = matrix
+        self._matrix_dirty = False
+        return matrix
+    
     async def search(
         self,
         query_embedding: List[float],
@@ -56,45 +101,57 @@ class InMemoryVectorStore:
         filter_dict: Optional[Dict] = None,
     ) -> List[Tuple[VectorDocument, float]]:
         """搜索文档"""
-        if not self._store:
+        if not self._store or top_k <= 0:
             return []
         
-        results = []
+        self._check_dim(query_embedding, self._stored_dim(), "query_embedding")
         
-        for doc_id, data in self._store.items():
-            doc = data["document"]
-            stored_emb = data["embedding"]
-            
-            if filter_dict:
-                match = True
-                for key, value in filter_dict.items():
-                    if doc.metadata.get(key) != value:
-                        match = False
-                        break
-                if not match:
-                    continue
-            
-            similarity = self._cosine_similarity(query_embedding, stored_emb)
-            results.append((doc, similarity))
+        import numpy as np
         
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
-    
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        """计算余弦相似度"""
-        dot_product = sum(x * y for x, y in zip(a, b))
-        norm_a = math.sqrt(sum(x * x for x in a))
-        norm_b = math.sqrt(sum(x * x for x in b))
+        matrix = self._ensure_matrix()
+        ids = self._ids
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            scores = np.zeros(len(ids), dtype=np.float32)
+        else:
+            scores = matrix @ (query / query_norm)
+        
+        if filter_dict:
+            candidates = np.fromiter(
+                (
+                    i for i, doc_id in enumerate(ids)
+                    if all(
+                        self._store[doc_id]["document"].metadata.get(key) == value
+                        for key, value in filter_dict.items()
+                    )
+                ),
+                dtype=np.int64,
+            )
+        else:
+            candidates = np.arange(len(ids))
+        
+        if len(candidates) == 0:
+            return []
         
-        if norm_a == 0 or norm_b == 0:
-            return 0
+        candidate_scores = scores[candidates]
+        if len(candidates) > top_k:
+            top = np.argpartition(-candidate_scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
         
-        return dot_product / (norm_a * norm_b)
+        return [
+            (self._store[ids[candidates[i]]]["document"], float(candidate_scores[i]))
+            for i in top
+        ]
     
     async def delete(self, ids: List[str]) -> None:
         """删除文档"""
         for id_ in ids:
             self._store.pop(id_, None)
+        self._matrix_dirty = True
     
     async def count(self) -> int:
         """返回文档数量"""
@@ -103,6 +160,7 @@ class InMemoryVectorStore:
     async def clear(self) -> None:
         """清空存储"""
         self._store.clear()
+        self._matrix_dirty = True
 
 
 class ChromaVectorStore:
@@ -580,7 +580,7 @@ class ChatService:
             
             llm_with_tools = self.llm.bind_tools(self.tools)
             
-            full_content = ""
+            full_parts: List[str] = []
             
             self._tracer.step("chat_streaming")
             
@@ -590,12 +590,12 @@ class ChatService:
                 if await interrupt_manager.is_interrupted(session_id):
                     yield {
                         "type": "interrupted",
-                        "content": full_content,
+                        "content": "".join(full_parts),
                         "message": "用户中断了输出",
                     }
                     return
                 
-                iteration_content = ""
+                iteration_parts: List[str] = []
                 tool_calls_by_index = {}
                 
                 with trace_step("llm_stream", {"iteration": iteration + 1}):
@@ -606,14 +606,14 @@ class ChatService:
                         if await interrupt_manager.is_interrupted(session_id):
                             yield {
                                 "type": "interrupted",
-                                "content": full_content,
+                                "content": "".join(full_parts),
                                 "message": "用户中断了输出",
                             }
                             return
                         
                         if chunk.content:
-                            iteration_content += chunk.content
-                            full_content += chunk.content
+                            iteration_parts.append(chunk.content)
+                            full_parts.append(chunk.content)
                             yield {
                                 "type": "content",
                                 "content": chunk.content,
@@ -644,7 +644,7 @@ class ChatService:
                                     else:
                                         tool_calls_by_index[tc_index]["args"] += str(args_str)
                 
-                ai_message = AIMessage(content=iteration_content)
+                ai_message = AIMessage(content="".join(iteration_parts))
                 
                 if tool_calls_by_index:
                     import json
@@ -666,6 +666,7 @@ class ChatService:
                 self._messages.append(ai_message)
                 
                 if not ai_message.tool_calls:
+                    full_content = "".join(full_parts)
                     logger.info(f"[ChatService] No tool calls, finalizing response: content_len={len(full_content)}")
                     
                     await self._finalize_conversation(message, full_content)
@@ -687,7 +688,7 @@ class ChatService:
                     if await interrupt_manager.is_interrupted(session_id):
                         yield {
                             "type": "interrupted",
-                            "content": full_content,
+                            "content": "".join(full_parts),
                             "message": "用户中断了输出",
                         }
                         return
@@ -731,7 +732,7 @@ class ChatService:
             
             yield {
                 "type": "done",
-                "content": full_content or "达到最大迭代次数，任务未完成",
+                "content": "".join(full_parts) or "达到最大迭代次数，任务未完成",
                 "trace": self._tracer.get_report(),
             }
             
@@ -740,7 +741,7 @@ class ChatService:
             end_chat_trace(error=str(e))
             yield {
                 "type": "interrupted",
-                "content": full_content,
+                "content": "".join(full_parts),
                 "message": str(e),
             }
         except Exception as e:
@@ -6,7 +6,7 @@
 2. 关键实体缓存
 3. 对话上下文提取
 """
-from typing import List, Optional, Any
+from typing import Iterable, List, Optional, Any, Tuple
 import re
 import logging
 
@@ -100,6 +100,21 @@ class ContextManager:
         intent: Optional[str] = None,
     ) -> None:
         """添加消息到历史"""
+        self._append_turn(role, content, intent)
+        self._trim()
+    
+    def add_messages(self, messages: Iterable[Tuple[str, str]]) -> None:
+        """批量添加 (role, content) 消息，全部追加后只裁剪一次"""
+        for role, content in messages:
+            self._append_turn(role, content)
+        self._trim()
+    
+    def _append_turn(
+        self,
+        role: str,
+        content: str,
+        intent: Optional[str] = None,
+    ) -> None:
         entities = self._entity_extractor.extract(content)
         
         turn = ConversationTurn(
@@ -114,25 +129,29 @@ class ContextManager:
         for entity in entities:
             if entity not in self._entity_cache:
                 self._entity_cache.append(entity)
-        
-        while len(self._history) > self.max_turns:
-            removed = self._history.pop(0)
+    
+    def _trim(self) -> None:
+        excess = len(self._history) - self.max_turns
+        if excess > 0:
+            del self._history[:excess]
         
         self._enforce_token_limit()
     
     def _enforce_token_limit(self) -> None:
         """确保历史不超过 Token 限制"""
-        if not self.token_counter:
+        if not self.token_counter or not self._history:
             return
         
-        while self._history:
-            total_tokens = sum(
-                self.token_counter.count_tokens(turn.content)
-                for turn in self._history
-            )
-            if total_tokens <= self.max_tokens:
-                break
-            self._history.pop(0)
+        counts = [self.token_counter.count_tokens(turn.content) for turn in self._history]
+        total_tokens = sum(counts)
+        
+        drop = 0
+        while drop < len(counts) and total_tokens > self.max_tokens:
+            total_tokens -= counts[drop]
+            drop += 1
+        
+        if drop:
+            del self._history[:drop]
     
     def get_history(self, limit: Optional[int] = None) -> List[ConversationTurn]:
         """获取对话历史"""
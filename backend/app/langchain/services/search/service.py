@@ -276,21 +276,21 @@ class SearchService:
         llm_with_tools = llm.bind_tools(self._tools)
         
         iterations = 0
-        full_content = ""
+        full_parts: List[str] = []
         
         try:
             for iteration in range(max_iterations):
                 iterations = iteration + 1
                 logger.info(f"[SearchService] Stream iteration {iterations}/{max_iterations}")
                 
-                iteration_content = ""
+                iteration_parts: List[str] = []
                 tool_calls_by_index = {}
                 
                 with trace_step("llm_stream", {"iteration": iterations}):
                     async for chunk in llm_with_tools.astream(messages):
                         if chunk.content:
-                            iteration_content += chunk.content
-                            full_content += chunk.content
+                            iteration_parts.append(chunk.content)
+                            full_parts.append(chunk.content)
                             yield {
                                 "type": "content",
                                 "content": chunk.content,
@@ -322,7 +322,7 @@ class SearchService:
                                         tool_calls_by_index[tc_index]["args"] += str(args_str)
                 
                 from langchain_core.messages import AIMessage
-                ai_message = AIMessage(content=iteration_content)
+                ai_message = AIMessage(content="".join(iteration_parts))
                 
                 if tool_calls_by_index:
                     import json
@@ -344,6 +344,7 @@ class SearchService:
                 messages.append(ai_message)
                 
                 if not ai_message.tool_calls:
+                    full_content = "".join(full_parts)
                     logger.info(f"[SearchService] No tool calls, finalizing: content_len={len(full_content)}")
                     
                     end_search_trace(output=full_content[:100] if full_content else None)
@@ -390,7 +391,7 @@ class SearchService:
             
             yield {
                 "type": "done",
-                "content": full_content or "研究超时，请稍后重试",
+                "content": "".join(full_parts) or "研究超时，请稍后重试",
             }
             
         except Exception as e:
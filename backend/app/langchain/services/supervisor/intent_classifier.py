@@ -4,7 +4,7 @@ from typing import Optional, List, Dict
 import re
 import time
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 from langchain_openai import ChatOpenAI
 
@@ -156,6 +156,10 @@ class IntentClassifier:
     }
     
     KB_CACHE_TTL = 300
+    LLM_CACHE_SIZE = 256
+    
+    # 节点每次调用都会新建分类器实例，缓存放在类上才能跨实例命中
+    _llm_cache: "OrderedDict[tuple, IntentResult]" = OrderedDict()
     
     def __init__(self, llm: ChatOpenAI, db_session=None):
         self.llm = llm
@@ -391,8 +395,20 @@ class IntentClassifier:
         
         return None
     
+    def _llm_cache_key(self, query: str) -> tuple:
+        """缓存键：模型标识 + 归一化后的查询"""
+        model = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None)
+        base_url = getattr(self.llm, "openai_api_base", None)
+        return (model, base_url, " ".join(query.split()))
+    
     async def _llm_classify(self, query: str) -> IntentResult:
-        """LLM语义分类"""
+        """LLM语义分类（相同模型、相同查询的成功结果会被缓存）"""
+        cache_key = self._llm_cache_key(query)
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            self._llm_cache.move_to_end(cache_key)
+            logger.info(f"[IntentClassifier] LLM cache hit: {cached.intent.value}")
+            return cached.model_copy(deep=True)
         
         prompt = f"""分析用户问题的意图，返回JSON格式的结果。
 
@@ -430,12 +446,18 @@ class IntentClassifier:
             
             result = json.loads(content)
             
-            return IntentResult(
+            intent_result = IntentResult(
                 intent=QueryIntent(result.get("intent", "ambiguous")),
                 confidence=result.get("confidence", 0.5),
                 kb_hints=result.get("kb_hints", []),
                 reasoning=result.get("reasoning", ""),
             )
+            
+            self._llm_cache[cache_key] = intent_result.model_copy(deep=True)
+            if len(self._llm_cache) > self.LLM_CACHE_SIZE:
+                self._llm_cache.popitem(last=False)
+            
+            return intent_result
         except Exception as e:
             return IntentResult(
                 intent=QueryIntent.AMBIGUOUS,
@@ -1,10 +1,32 @@
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
+from typing import Optional
 from app.config import settings
 import httpx
 import json
 
 
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """搜索工具共享的 HTTP 客户端，复用连接池避免每次搜索重新握手"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class TavilyInput(BaseModel):
     query: str = Field(description="搜索查询内容")
     max_results: int = Field(default=5, description="返回结果数量")
@@ -27,21 +49,21 @@ async def tavily_search(query: str, max_results: int = 5) -> str:
         return "错误: TAVILY_API_KEY 未配置"
     
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
-                "https://api.tavily.com/search",
-                headers={
-                    "Authorization": f"Bearer {settings.TAVILY_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "query": query,
-                    "max_results": max_results,
-                    "include_answer": True,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client()
+        response = await client.post(
+            "https://api.tavily.com/search",
+            headers={
+                "Authorization": f"Bearer {settings.TAVILY_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "query": query,
+                "max_results": max_results,
+                "include_answer": True,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
         
         results = []
         if data.get("answer"):
@@ -65,18 +87,18 @@ async def tavily_search(query: str, max_results: int = 5) -> str:
 async def duckduckgo_search(query: str, max_results: int = 5) -> str:
     """使用DuckDuckGo搜索引擎搜索信息，免费无需API密钥"""
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                "https://api.duckduckgo.com/",
-                params={
-                    "q": query,
-                    "format": "json",
-                    "no_html": 1,
-                    "skip_disambig": 1,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client()
+        response = await client.get(
+            "https://api.duckduckgo.com/",
+            params={
+                "q": query,
+                "format": "json",
+                "no_html": 1,
+                "skip_disambig": 1,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
         
         results = []
         if data.get("AbstractText"):
@@ -106,19 +128,19 @@ async def serpapi_search(query: str, num: int = 10) -> str:
         return "错误: SERPAPI_API_KEY 未配置"
     
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                "https://serpapi.com/search",
-                params={
-                    "api_key": settings.SERPAPI_API_KEY,
-                    "q": query,
-                    "num": num,
-                    "hl": "zh-cn",
-                    "gl": "cn",
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client()
+        response = await client.get(
+            "https://serpapi.com/search",
+            params={
+                "api_key": settings.SERPAPI_API_KEY,
+                "q": query,
+                "num": num,
+                "hl": "zh-cn",
+                "gl": "cn",
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
         
         results = []
         
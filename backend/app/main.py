@@ -81,6 +81,9 @@ async def lifespan(app: FastAPI):
         print("=" * 50 + "\n")
     
     yield
+    
+    from app.langchain.tools.search_tools import close_http_client
+    await close_http_client()
 
 
 app = FastAPI(
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import logging
 import sys
 import os
 from pathlib import Path
@@ -10,6 +11,8 @@ from pydantic import BaseModel, Field, create_model
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def get_workspace_path() -> Path:
     workspace = settings.WORKSPACE_PATH
@@ -393,61 +396,38 @@ async def get_notion_mcp_tools() -> List[BaseTool]:
 
 
 async def get_all_mcp_tools() -> List[BaseTool]:
+    from .feishu_client import get_feishu_mcp_tools
+    
     tools = []
     
     print("\n" + "=" * 60)
     print("开始加载 MCP 工具...")
     print("=" * 60)
     
-    try:
-        word_tools = await get_word_mcp_tools()
-        tools.extend(word_tools)
-        print(f"✅ Word MCP: {len(word_tools)} 个工具")
-    except Exception as e:
-        import traceback
-        print(f"❌ Word MCP 加载失败: {e}")
-        traceback.print_exc()
-    
-    try:
-        excel_tools = await get_excel_mcp_tools()
-        tools.extend(excel_tools)
-        print(f"✅ Excel MCP: {len(excel_tools)} 个工具")
-    except Exception as e:
-        import traceback
-        print(f"❌ Excel MCP 加载失败: {e}")
-        traceback.print_exc()
-    
-    try:
-        pptx_tools = await get_pptx_mcp_tools()
-        tools.extend(pptx_tools)
-        print(f"✅ PPTX MCP: {len(pptx_tools)} 个工具")
-    except Exception as e:
-        import traceback
-        print(f"❌ PPTX MCP 加载失败: {e}")
-        traceback.print_exc()
-    
-    try:
-        notion_tools = await get_notion_mcp_tools()
-        tools.extend(notion_tools)
-        print(f"✅ Notion MCP: {len(notion_tools)} 个工具")
-    except Exception as e:
-        import traceback
-        print(f"❌ Notion MCP 加载失败: {e}")
-        traceback.print_exc()
-    
-    try:
-        from .feishu_client import get_feishu_mcp_tools
-        feishu_tools = await get_feishu_mcp_tools()
-        tools.extend(feishu_tools)
-        print(f"✅ Feishu MCP: {len(feishu_tools)} 个工具")
-    except Exception as e:
-        import traceback
-        print(f"❌ Feishu MCP 加载失败: {e}")
-        traceback.print_exc()
+    loaders = [
+        ("Word", get_word_mcp_tools),
+        ("Excel", get_excel_mcp_tools),
+        ("PPTX", get_pptx_mcp_tools),
+        ("Notion", get_notion_mcp_tools),
+        ("Feishu", get_feishu_mcp_tools),
+    ]
+    
+    # 各 MCP 服务器互不依赖，并发启动
+    results = await asyncio.gather(
+        *[loader() for _, loader in loaders],
+        return_exceptions=True,
+    )
+    
+    for (name, _), result in zip(loaders, results):
+        if isinstance(result, BaseException):
+            print(f"❌ {name} MCP 加载失败: {result}")
+            logger.debug(f"{name} MCP load failure traceback", exc_info=result)
+        else:
+            tools.extend(result)
+            print(f"✅ {name} MCP: {len(result)} 个工具")
     
     print("=" * 60)
     print(f"总计加载 {len(tools)} 个 MCP 工具")
     print("=" * 60 + "\n")
     
     return tools
-
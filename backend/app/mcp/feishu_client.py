@@ -2,33 +2,59 @@ import asyncio
 import os
 import sys
 import platform
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 from pathlib import Path
 
-from mcp.client.stdio import stdio_client, StdioServerParameters
-from mcp.client.session import ClientSession
+if TYPE_CHECKING:
+    from mcp.client.session import ClientSession
+    from langchain_core.tools import BaseTool
 
-from langchain_core.tools import BaseTool, StructuredTool
-from pydantic import Field, create_model
 
+_TYPE_MAP = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
 
-_feishu_session: Optional[ClientSession] = None
-_feishu_tools: List[BaseTool] = []
+_OPTIONAL_TYPE_MAP = {k: Optional[v] for k, v in _TYPE_MAP.items()}
+
+_feishu_session: Optional["ClientSession"] = None
+_feishu_tools: List["BaseTool"] = []
 _feishu_context_manager = None
 _feishu_read = None
 _feishu_write = None
+_feishu_start_lock = asyncio.Lock()
+
+
+async def start_feishu_mcp_session() -> "ClientSession":
+    if _feishu_session is not None and _feishu_read is not None and _feishu_write is not None:
+        return _feishu_session
+    
+    async with _feishu_start_lock:
+        return await _start_feishu_mcp_session_locked()
 
 
-async def start_feishu_mcp_session() -> ClientSession:
+async def stop_feishu_mcp_session():
+    async with _feishu_start_lock:
+        await _stop_feishu_mcp_session_locked()
+
+
+async def _start_feishu_mcp_session_locked() -> "ClientSession":
     global _feishu_session, _feishu_context_manager, _feishu_read, _feishu_write
     
+    from mcp.client.stdio import stdio_client, StdioServerParameters
+    from mcp.client.session import ClientSession
+    
     if _feishu_session is not None:
         try:
             if _feishu_read is not None and _feishu_write is not None:
                 return _feishu_session
         except Exception:
             pass
-        await stop_feishu_mcp_session()
+        await _stop_feishu_mcp_session_locked()
     
     feishu_app_id = os.getenv("FEISHU_APP_ID")
     feishu_app_secret = os.getenv("FEISHU_APP_SECRET")
@@ -70,7 +96,7 @@ async def start_feishu_mcp_session() -> ClientSession:
     return _feishu_session
 
 
-async def stop_feishu_mcp_session():
+async def _stop_feishu_mcp_session_locked():
     global _feishu_session, _feishu_context_manager, _feishu_read, _feishu_write
     
     if _feishu_session is not None:
@@ -93,7 +119,7 @@ async def stop_feishu_mcp_session():
     print("Feishu MCP session stopped")
 
 
-async def get_feishu_mcp_tools() -> List[BaseTool]:
+async def get_feishu_mcp_tools() -> List["BaseTool"]:
     global _feishu_tools
     
     max_retries = 3
@@ -104,11 +130,10 @@ async def get_feishu_mcp_tools() -> List[BaseTool]:
             tools_response = await session.list_tools()
             mcp_tools = tools_response.tools
             
-            _feishu_tools = []
-            
-            for mcp_tool in mcp_tools:
-                tool = _convert_mcp_tool_to_langchain(session, mcp_tool)
-                _feishu_tools.append(tool)
+            _feishu_tools = [
+                _convert_mcp_tool_to_langchain(session, mcp_tool)
+                for mcp_tool in mcp_tools
+            ]
             
             print(f"Loaded {len(_feishu_tools)} Feishu MCP tools")
             return _feishu_tools
@@ -123,31 +148,37 @@ async def get_feishu_mcp_tools() -> List[BaseTool]:
                 raise
 
 
-def _convert_mcp_tool_to_langchain(session: ClientSession, mcp_tool) -> BaseTool:
+def _convert_mcp_tool_to_langchain(session: "ClientSession", mcp_tool) -> "BaseTool":
+    from langchain_core.tools import StructuredTool
+    
     tool_name = mcp_tool.name
     tool_description = mcp_tool.description or ""
     
     input_schema = mcp_tool.inputSchema or {}
-    properties = input_schema.get("properties", {})
-    required = input_schema.get("required", [])
+    properties = input_schema.get("properties") or {}
     
-    field_definitions = {}
-    for prop_name, prop_info in properties.items():
-        prop_type = prop_info.get("type", "string")
-        prop_desc = prop_info.get("description", "")
+    args_schema = None
+    if properties:
+        from pydantic import Field, create_model
         
-        python_type = _json_type_to_python(prop_type)
+        required = set(input_schema.get("required") or ())
+        field_definitions = {}
+        for prop_name, prop_info in properties.items():
+            prop_type = prop_info.get("type", "string")
+            prop_desc = prop_info.get("description", "")
+            
+            if prop_name in required:
+                field_definitions[prop_name] = (
+                    _TYPE_MAP.get(prop_type, str),
+                    Field(description=prop_desc),
+                )
+            else:
+                field_definitions[prop_name] = (
+                    _OPTIONAL_TYPE_MAP.get(prop_type, Optional[str]),
+                    Field(default=None, description=prop_desc),
+                )
         
-        if prop_name in required:
-            field_definitions[prop_name] = (python_type, Field(description=prop_desc))
-        else:
-            from typing import Optional
-            field_definitions[prop_name] = (Optional[python_type], Field(default=None, description=prop_desc))
-    
-    args_schema = create_model(
-        f"{tool_name}Input",
-        **field_definitions
-    ) if field_definitions else None
+        args_schema = create_model(f"{tool_name}Input", **field_definitions)
     
     async def _run(**kwargs):
         result = await session.call_tool(tool_name, arguments=kwargs)
@@ -168,19 +199,6 @@ def _convert_mcp_tool_to_langchain(session: ClientSession, mcp_tool) -> BaseTool
     )
 
 
-def _json_type_to_python(json_type: str):
-    from typing import Optional
-    type_map = {
-        "string": str,
-        "integer": int,
-        "number": float,
-        "boolean": bool,
-        "array": list,
-        "object": dict,
-    }
-    return type_map.get(json_type, str)
-
-
 async def call_feishu_tool(tool_name: str, arguments: dict) -> str:
     session = await start_feishu_mcp_session()
     result = await session.call_tool(tool_name, arguments=arguments)
@@ -9,6 +9,7 @@ from .loader import SkillLoader
 from .matcher import SkillMatcher, MatchResult
 from .manager import SkillManager
 from .tracer import get_skill_tracer, skill_trace_step, SkillTracer
+from .embedder import SkillEmbedder, get_embedder
 
 __all__ = [
     "Skill",
@@ -23,4 +24,6 @@ __all__ = [
     "get_skill_tracer",
     "skill_trace_step",
     "SkillTracer",
+    "SkillEmbedder",
+    "get_embedder",
 ]
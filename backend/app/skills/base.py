@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 from datetime import datetime
+import json
 import re
+import time
 import yaml
 
 
@@ -12,8 +14,20 @@ DANGEROUS_TOOLS = {
     "move_file": "移动文件",
 }
 
+_TOOL_RE = re.compile(
+    r'##\s*Tool:\s*(\w+)\s*\n'
+    r'(?:###\s*Description\s*\n(.*?)\n)?'
+    r'(?:###\s*Parameters\s*\n```json\s*\n(.*?)\n```)?',
+    re.DOTALL
+)
 
-@dataclass
+
+def truncate_text(text: str, limit: int = 100) -> str:
+    """截断过长文本，用于追踪日志中的预览"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+@dataclass(slots=True)
 class SkillMeta:
     name: str
     description: str
@@ -25,6 +39,16 @@ class SkillMeta:
     dependencies: Dict[str, List[str]] = field(default_factory=dict)
     matching: Dict[str, List[str]] = field(default_factory=dict)
     permissions: Dict[str, Any] = field(default_factory=dict)
+    _allowed_set: frozenset = field(default=frozenset(), init=False, repr=False, compare=False)
+    _forbidden_set: frozenset = field(default=frozenset(), init=False, repr=False, compare=False)
+    _tags_lower: Tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    _keywords_lower: Tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._allowed_set = frozenset(self.permissions.get("allowed_tools") or ())
+        self._forbidden_set = frozenset(self.permissions.get("forbidden_tools") or ())
+        self._tags_lower = tuple(tag.lower() for tag in self.tags)
+        self._keywords_lower = tuple(kw.lower() for kw in self.matching.get("keywords") or ())
     
     def to_dict(self) -> dict:
         return {
@@ -41,13 +65,13 @@ class SkillMeta:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
     meta: SkillMeta
     content: str
     instructions: str
     path: Path
-    loaded_at: datetime = field(default_factory=datetime.now)
+    loaded_at: float = field(default_factory=time.monotonic)
     
     def get_allowed_tools(self) -> List[str]:
         return self.meta.permissions.get("allowed_tools", [])
@@ -56,26 +80,24 @@ class Skill:
         return self.meta.permissions.get("forbidden_tools", [])
     
     def has_tool_permission(self, tool_name: str) -> bool:
-        forbidden = self.get_forbidden_tools()
-        if tool_name in forbidden:
+        if tool_name in self.meta._forbidden_set:
             return False
         
-        allowed = self.get_allowed_tools()
-        if not allowed:
-            return True
-        
-        return tool_name in allowed
+        allowed = self.meta._allowed_set
+        return not allowed or tool_name in allowed
     
     def to_dict(self) -> dict:
         return {
             "meta": self.meta.to_dict(),
             "content": self.content[:500] + "..." if len(self.content) > 500 else self.content,
             "path": str(self.path),
-            "loaded_at": self.loaded_at.isoformat(),
+            "loaded_at": datetime.fromtimestamp(
+                time.time() - (time.monotonic() - self.loaded_at)
+            ).isoformat(),
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillTool:
     name: str
     description: str
@@ -91,17 +113,38 @@ class SkillTool:
 
 
 class SkillParser:
+    @staticmethod
+    def split_frontmatter(content: str) -> Optional[Tuple[str, int]]:
+        if not content.startswith("---"):
+            return None
+        
+        first_nl = content.find("\n")
+        if first_nl == -1 or content[3:first_nl].strip():
+            return None
+        
+        pos = first_nl + 1
+        while True:
+            end = content.find("\n---", pos)
+            if end == -1:
+                return None
+            
+            line_end = content.find("\n", end + 4)
+            if line_end != -1 and not content[end + 4:line_end].strip():
+                return content[first_nl + 1:end], line_end + 1
+            
+            pos = end + 1
+    
     @staticmethod
     def parse_skill_md(content: str, path: Path) -> Optional[Skill]:
         try:
-            frontmatter_match = re.match(r'^---\s*\n(.*?)\n---\s*\n(.*)$', content, re.DOTALL)
+            split = SkillParser.split_frontmatter(content)
             
-            if not frontmatter_match:
+            if not split:
                 print(f"Invalid SKILL.md format: {path}")
                 return None
             
-            frontmatter_str = frontmatter_match.group(1)
-            instructions = frontmatter_match.group(2).strip()
+            frontmatter_str, body_start = split
+            instructions = content[body_start:].strip()
             
             frontmatter = yaml.safe_load(frontmatter_str)
             
@@ -141,26 +184,22 @@ class SkillParser:
     def parse_tool_definition(content: str) -> List[SkillTool]:
         tools = []
         
-        tool_pattern = re.compile(
-            r'##\s*Tool:\s*(\w+)\s*\n'
-            r'(?:###\s*Description\s*\n(.*?)\n)?'
-            r'(?:###\s*Parameters\s*\n```json\s*\n(.*?)\n```)?',
-            re.DOTALL
-        )
-        
-        for match in tool_pattern.finditer(content):
-            name = match.group(1)
-            description = match.group(2) or ""
-            params_str = match.group(3) or "{}"
+        for match in _TOOL_RE.finditer(content):
+            name, description, params_str = match.groups()
             
-            try:
-                parameters = yaml.safe_load(params_str) if params_str else {}
-            except:
-                parameters = {}
+            parameters = {}
+            if params_str and params_str.strip() not in ("", "{}"):
+                try:
+                    parameters = json.loads(params_str)
+                except ValueError:
+                    try:
+                        parameters = yaml.safe_load(params_str) or {}
+                    except Exception:
+                        parameters = {}
             
             tools.append(SkillTool(
                 name=name,
-                description=description.strip(),
+                description=(description or "").strip(),
                 parameters=parameters,
                 implementation="",
             ))
@@ -0,0 +1,171 @@
+"""
+Skills 向量化模块
+进程内共享一个 embedding 模型，并持久化 skill 描述的向量
+"""
+from typing import Dict, List, Optional, TYPE_CHECKING
+from pathlib import Path
+import asyncio
+import hashlib
+import logging
+import os
+import pickle
+import threading
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .base import Skill
+
+logger = logging.getLogger(__name__)
+
+
+SKILL_EMBEDDING_CACHE_PATH = Path("./.cache/skill_embeddings_v1.pkl")
+SKILL_EMBEDDING_MAX_CHARS = 2000
+
+
+class SkillEmbedder:
+    """Skill 向量化器，模型懒加载，skill 向量按内容哈希缓存到磁盘"""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        cache_path: Path = SKILL_EMBEDDING_CACHE_PATH,
+    ):
+        self.model_name = model_name
+        self.cache_path = Path(cache_path)
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._cache: Optional[Dict[str, "np.ndarray"]] = None
+        self._cache_lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError("sentence-transformers not installed. Run: pip install sentence-transformers")
+
+        from app.config import settings
+        from app.core.device_utils import get_optimal_device
+        from app.knowledge_base.services.embedding import get_local_model_path
+
+        model_name = self.model_name or settings.EMBEDDING_MODEL
+        device = get_optimal_device()
+        logger.info(f"Loading skill embedding model: {model_name} on {device}")
+
+        model_path = get_local_model_path(model_name) or model_name
+        try:
+            return SentenceTransformer(model_path, trust_remote_code=True, device=device)
+        except Exception as e:
+            if "cuda" in device or device == "mps":
+                logger.warning(f"Failed to load skill embedding model on {device}, falling back to CPU: {e}")
+                return SentenceTransformer(model_path, trust_remote_code=True, device="cpu")
+            raise
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> "np.ndarray":
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    async def embed_text(self, text: str) -> "np.ndarray":
+        embeddings = await asyncio.to_thread(self.encode, [text])
+        return embeddings[0]
+
+    @staticmethod
+    def skill_text(skill: "Skill") -> str:
+        return (
+            f"{skill.meta.name}\n{skill.meta.description}\n"
+            f"{skill.instructions[:SKILL_EMBEDDING_MAX_CHARS]}"
+        )
+
+    @staticmethod
+    def cache_key(name: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return f"{name}:{digest}"
+
+    def get_skill_embedding(self, skill: "Skill") -> "np.ndarray":
+        return self.encode_skills([skill])[0]
+
+    def encode_skills(self, skills: List["Skill"]) -> "np.ndarray":
+        """返回 (N, D) float32 矩阵，未缓存的 skill 合并为一次批量 encode"""
+        import numpy as np
+
+        texts = [self.skill_text(skill) for skill in skills]
+        keys = [self.cache_key(skill.meta.name, text) for skill, text in zip(skills, texts)]
+
+        with self._cache_lock:
+            cache = self._load_cache()
+            missing = [i for i, key in enumerate(keys) if key not in cache]
+
+        if missing:
+            embeddings = self.encode([texts[i] for i in missing])
+            with self._cache_lock:
+                for i, embedding in zip(missing, embeddings):
+                    self._prune(skills[i].meta.name, keep=keys[i])
+                    cache[keys[i]] = embedding
+                self._save_cache()
+
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([cache[key] for key in keys]).astype(np.float32, copy=False)
+
+    def invalidate(self, name: str):
+        """删除某个 skill 的全部缓存向量"""
+        with self._cache_lock:
+            self._load_cache()
+            if self._prune(name):
+                self._save_cache()
+
+    def _prune(self, name: str, keep: Optional[str] = None) -> int:
+        prefix = f"{name}:"
+        stale = [k for k in self._cache if k.startswith(prefix) and k != keep]
+        for key in stale:
+            del self._cache[key]
+        return len(stale)
+
+    def _load_cache(self) -> Dict[str, "np.ndarray"]:
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path.exists():
+                try:
+                    with open(self.cache_path, "rb") as f:
+                        cache = pickle.load(f)
+                    # 旧格式以 skill 名为 key，无法判断内容是否变化，直接丢弃重新计算
+                    self._cache = {k: v for k, v in cache.items() if ":" in k}
+                except Exception as e:
+                    logger.warning(f"Failed to load skill embedding cache {self.cache_path}: {e}")
+        return self._cache
+
+    def _save_cache(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(self._cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to save skill embedding cache {self.cache_path}: {e}")
+
+
+_embedder: Optional[SkillEmbedder] = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder() -> SkillEmbedder:
+    """获取全局 SkillEmbedder 实例"""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = SkillEmbedder()
+    return _embedder
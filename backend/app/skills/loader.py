@@ -1,9 +1,10 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Union
-from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Union
 import asyncio
+import os
+import time
 import aiofiles
-from watchfiles import awatch
 
 from .base import Skill, SkillParser
 
@@ -13,6 +14,7 @@ class SkillLoader:
         self,
         skills_dir: Union[str, List[str]] = "./skills",
         enable_watcher: bool = False,
+        refresh_interval: float = 2.0,
     ):
         if isinstance(skills_dir, str):
             self.skills_dirs = [Path(skills_dir)]
@@ -21,8 +23,17 @@ class SkillLoader:
         
         self.enable_watcher = enable_watcher
         self._cache: Dict[str, Skill] = {}
-        self._last_modified: Dict[str, datetime] = {}
+        self._last_modified: Dict[str, int] = {}
+        self._path_to_name: Dict[str, str] = {}
         self._watcher_task: Optional[asyncio.Task] = None
+        self.refresh_interval = refresh_interval
+        self._last_refresh = time.monotonic()
+        self._version = 0
+    
+    @property
+    def version(self) -> int:
+        """缓存内容每次变化时递增，供 matcher 判断派生缓存是否失效"""
+        return self._version
     
     def discover_skills(self) -> List[Path]:
         skill_files = []
@@ -31,13 +42,33 @@ class SkillLoader:
             if not skills_dir.exists():
                 continue
             
-            for skill_file in skills_dir.rglob("SKILL.md"):
-                skill_files.append(skill_file)
+            stack = [str(skills_dir)]
+            while stack:
+                current = stack.pop()
+                try:
+                    entries = os.scandir(current)
+                except OSError:
+                    continue
+                
+                with entries:
+                    for entry in entries:
+                        if entry.name == "SKILL.md":
+                            skill_files.append(Path(entry.path))
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
         
         return skill_files
     
     async def load(self, skill_path: Path) -> Optional[Skill]:
         try:
+            mtime = skill_path.stat().st_mtime_ns
+            path_key = str(skill_path)
+            
+            if self._last_modified.get(path_key) == mtime:
+                skill_name = self._find_skill_name_by_path(skill_path)
+                if skill_name and skill_name in self._cache:
+                    return self._cache[skill_name]
+            
             async with aiofiles.open(skill_path, "r", encoding="utf-8") as f:
                 content = await f.read()
             
@@ -45,7 +76,9 @@ class SkillLoader:
             
             if skill:
                 self._cache[skill.meta.name] = skill
-                self._last_modified[str(skill_path)] = datetime.now()
+                self._last_modified[path_key] = mtime
+                self._path_to_name[path_key] = skill.meta.name
+                self._version += 1
             
             return skill
             
@@ -78,17 +111,81 @@ class SkillLoader:
     def get_cached(self, name: str) -> Optional[Skill]:
         return self._cache.get(name)
     
-    def get_all_cached(self) -> Dict[str, Skill]:
-        return self._cache.copy()
+    def get_all_cached(self) -> Mapping[str, Skill]:
+        return MappingProxyType(self._cache)
+    
+    def iter_cached(self) -> Iterator[Skill]:
+        return iter(self._cache.values())
+    
+    def enabled_skills(self) -> List[Skill]:
+        return [s for s in self._cache.values() if s.meta.enabled]
+    
+    async def refresh_if_stale(self) -> int:
+        """距上次检查超过 refresh_interval 时检查 mtime，文件监听运行时由监听负责"""
+        if self._watcher_task is not None or not self._last_modified:
+            return 0
+        
+        now = time.monotonic()
+        if now - self._last_refresh < self.refresh_interval:
+            return 0
+        
+        self._last_refresh = now
+        return await self.refresh_changed()
+    
+    async def refresh_changed(self) -> int:
+        """只重新加载 mtime 变化的 SKILL.md，删除已不存在的文件，返回变化数量"""
+        snapshot = dict(self._last_modified)
+        current_mtimes = await asyncio.to_thread(self._stat_paths, list(snapshot))
+        
+        changed = 0
+        for path_key, mtime in snapshot.items():
+            if path_key not in current_mtimes:
+                continue
+            
+            current = current_mtimes[path_key]
+            if current is None:
+                skill_name = self._path_to_name.get(path_key)
+                if skill_name:
+                    self.remove_cached(skill_name)
+                else:
+                    self._last_modified.pop(path_key, None)
+                changed += 1
+            elif current != mtime:
+                await self.load(Path(path_key))
+                changed += 1
+        
+        return changed
+    
+    @staticmethod
+    def _stat_paths(path_keys: List[str]) -> Dict[str, Optional[int]]:
+        """在线程中逐个 stat，文件已删除时记为 None，其它错误跳过"""
+        mtimes: Dict[str, Optional[int]] = {}
+        for path_key in path_keys:
+            try:
+                mtimes[path_key] = os.stat(path_key).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[path_key] = None
+            except OSError:
+                continue
+        return mtimes
+    
+    def remove_cached(self, name: str) -> Optional[Skill]:
+        skill = self._cache.pop(name, None)
+        if skill:
+            path_key = str(skill.path)
+            self._last_modified.pop(path_key, None)
+            self._path_to_name.pop(path_key, None)
+            self._version += 1
+        return skill
     
     def clear_cache(self):
         self._cache.clear()
         self._last_modified.clear()
+        self._path_to_name.clear()
+        self._version += 1
     
     async def reload(self, name: str) -> Optional[Skill]:
-        if name in self._cache:
-            del self._cache[name]
-        
+        self.remove_cached(name)
         return await self.load_by_name(name)
     
     async def start_watcher(self):
@@ -107,6 +204,8 @@ class SkillLoader:
             self._watcher_task = None
     
     async def _watch_loop(self):
+        from watchfiles import awatch
+        
         for skills_dir in self.skills_dirs:
             async for changes in awatch(str(skills_dir)):
                 for change_type, path_str in changes:
@@ -117,19 +216,26 @@ class SkillLoader:
                             await self.load(path)
                             print(f"Skill loaded: {path}")
                         elif change_type == 2:
+                            if self._is_unchanged(path):
+                                continue
                             await self.load(path)
                             print(f"Skill reloaded: {path}")
                         elif change_type == 3:
-                            skill_name = self._find_skill_name_by_path(path)
+                            skill_name = self._path_to_name.pop(path_str, None)
+                            self._last_modified.pop(path_str, None)
                             if skill_name and skill_name in self._cache:
                                 del self._cache[skill_name]
+                                self._version += 1
                                 print(f"Skill removed: {skill_name}")
     
+    def _is_unchanged(self, path: Path) -> bool:
+        try:
+            return self._last_modified.get(str(path)) == path.stat().st_mtime_ns
+        except OSError:
+            return False
+    
     def _find_skill_name_by_path(self, path: Path) -> Optional[str]:
-        for name, skill in self._cache.items():
-            if skill.path == path:
-                return name
-        return None
+        return self._path_to_name.get(str(path))
     
     def get_skill_summaries(self) -> List[Dict]:
         summaries = []
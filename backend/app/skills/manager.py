@@ -1,27 +1,49 @@
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 import asyncio
+import shutil
+import yaml
 
-from .base import Skill, SkillTool, DANGEROUS_TOOLS
+from .base import Skill, SkillTool, DANGEROUS_TOOLS, truncate_text
 from .loader import SkillLoader
 from .matcher import SkillMatcher, MatchResult
 from .tracer import get_skill_tracer, skill_trace_step
 
 
+_PROMPT_CACHE_SIZE = 64
+
+
+def _write_skill_file(skill_path: Path, content: str):
+    skill_path.parent.mkdir(parents=True, exist_ok=True)
+    skill_path.write_text(content, encoding="utf-8")
+
+
 class SkillManager:
     def __init__(
         self,
         skills_dir: Union[str, List[str]] = "./skills",
         llm=None,
         enable_watcher: bool = False,
+        embedding_service=None,
     ):
+        from app.config import settings
+        
+        if embedding_service is None and settings.SKILL_EMBEDDING_ENABLED:
+            from .embedder import get_embedder
+            embedding_service = get_embedder()
+        
         self.loader = SkillLoader(skills_dir, enable_watcher)
-        self.matcher = SkillMatcher(llm)
+        self.matcher = SkillMatcher(
+            llm,
+            embedding_service,
+            embedding_precision=settings.SKILL_EMBEDDING_PRECISION,
+        )
         self.llm = llm
         
         self._active_skills: Dict[str, Skill] = {}
         self._skill_tools: Dict[str, SkillTool] = {}
+        self._prompt_cache: Dict[Tuple[Tuple[str, float], ...], str] = {}
         self._initialized = False
     
     async def initialize(self):
@@ -31,8 +53,13 @@ class SkillManager:
             
             await self.loader.load_all()
             
+            self.matcher.sync_version(self.loader.version)
+            warm_up = self.matcher.warm(self.loader.enabled_skills())
+            
             if self.loader.enable_watcher:
-                await self.loader.start_watcher()
+                await asyncio.gather(warm_up, self.loader.start_watcher())
+            else:
+                await warm_up
             
             self._initialized = True
             
@@ -55,7 +82,7 @@ class SkillManager:
         
         return await self.loader.load_by_name(name)
     
-    def get_all_skills(self) -> Dict[str, Skill]:
+    def get_all_skills(self) -> Mapping[str, Skill]:
         return self.loader.get_all_cached()
     
     def get_skill_summaries(self) -> List[Dict]:
@@ -67,24 +94,27 @@ class SkillManager:
         available_tools: List[str],
     ) -> MatchResult:
         with skill_trace_step("match_request", "manager", {
-            "query": query[:100] + "..." if len(query) > 100 else query,
+            "query": truncate_text(query),
             "available_tools_count": len(available_tools),
         }):
-            skills = list(self.loader.get_all_cached().values())
-            enabled_skills = [s for s in skills if s.meta.enabled]
+            await self.loader.refresh_if_stale()
+            enabled_skills = self.loader.enabled_skills()
+            self.matcher.sync_version(self.loader.version)
             
             if self.llm:
                 result = await self.matcher.match(query, enabled_skills, available_tools)
             else:
-                result = self.matcher._fallback_match(query, enabled_skills, available_tools)
-            
-            get_skill_tracer().trace("match_result", "matcher", {
-                "matched_skill": result.skill.meta.name if result.skill else None,
-                "matched_tool": result.tool_name,
-                "confidence": result.confidence,
-                "is_skill_match": result.is_skill_match,
-                "reasoning": result.reasoning[:100] if result.reasoning else None,
-            })
+                result = await self.matcher.match_without_llm(query, enabled_skills, available_tools)
+            
+            tracer = get_skill_tracer()
+            if tracer.enabled:
+                tracer.trace("match_result", "matcher", {
+                    "matched_skill": result.skill.meta.name if result.skill else None,
+                    "matched_tool": result.tool_name,
+                    "confidence": result.confidence,
+                    "is_skill_match": result.is_skill_match,
+                    "reasoning": truncate_text(result.reasoning) if result.reasoning else None,
+                })
             
             return result
     
@@ -128,6 +158,16 @@ class SkillManager:
             if not skills:
                 return ""
             
+            cache_key = tuple((s.meta.name, s.loaded_at) for s in skills)
+            cached = self._prompt_cache.get(cache_key)
+            if cached is not None:
+                get_skill_tracer().trace("skill_prompt_cached", "prompt", {
+                    "total_len": len(cached),
+                    "skills_count": len(skills),
+                })
+                return cached
+            
+            tracer = get_skill_tracer()
             parts = []
             
             for skill in skills:
@@ -139,15 +179,20 @@ class SkillManager:
 """
                 parts.append(skill_prompt)
                 
-                get_skill_tracer().trace("skill_prompt_injected", "prompt", {
-                    "skill_name": skill.meta.name,
-                    "instructions_len": len(skill.instructions),
-                    "description": skill.meta.description,
-                })
+                if tracer.enabled:
+                    tracer.trace("skill_prompt_injected", "prompt", {
+                        "skill_name": skill.meta.name,
+                        "instructions_len": len(skill.instructions),
+                        "description": skill.meta.description,
+                    })
             
             result = "\n".join(parts)
             
-            get_skill_tracer().trace("skill_prompt_built", "prompt", {
+            if len(self._prompt_cache) >= _PROMPT_CACHE_SIZE:
+                self._prompt_cache.pop(next(iter(self._prompt_cache)))
+            self._prompt_cache[cache_key] = result
+            
+            tracer.trace("skill_prompt_built", "prompt", {
                 "total_len": len(result),
                 "skills_count": len(skills),
             })
@@ -162,15 +207,11 @@ class SkillManager:
         tags: List[str] = None,
         permissions: Dict = None,
     ) -> Optional[Skill]:
-        from .base import SkillMeta
-        
         if self.loader.skills_dirs:
             skill_dir = self.loader.skills_dirs[0] / name.replace("-", "_")
         else:
             skill_dir = Path("./skills") / name.replace("-", "_")
         
-        skill_dir.mkdir(parents=True, exist_ok=True)
-        
         skill_path = skill_dir / "SKILL.md"
         
         frontmatter = {
@@ -181,15 +222,12 @@ class SkillManager:
             "permissions": permissions or {},
         }
         
-        import yaml
         frontmatter_str = yaml.dump(frontmatter, allow_unicode=True, default_flow_style=False)
         
         content = f"---\n{frontmatter_str}---\n\n{instructions}"
         
         try:
-            import aiofiles
-            async with aiofiles.open(skill_path, "w", encoding="utf-8") as f:
-                await f.write(content)
+            await asyncio.to_thread(_write_skill_file, skill_path, content)
             
             skill = await self.loader.load(skill_path)
             return skill
@@ -204,16 +242,20 @@ class SkillManager:
             return False
         
         try:
-            import shutil
             skill_dir = skill.path.parent
-            shutil.rmtree(skill_dir)
+            await asyncio.to_thread(shutil.rmtree, skill_dir)
             
-            if name in self.loader._cache:
-                del self.loader._cache[name]
+            self.loader.remove_cached(name)
+            
+            invalidate = getattr(self.matcher.embedding_service, "invalidate", None)
+            if invalidate is not None:
+                await asyncio.to_thread(invalidate, name)
             
             if name in self._active_skills:
                 del self._active_skills[name]
             
+            self._prompt_cache.clear()
+            
             return True
             
         except Exception as e:
@@ -1,6 +1,14 @@
-from typing import List, Optional, Dict, Tuple
-from dataclasses import dataclass
+from typing import Any, FrozenSet, List, Optional, Dict, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+import asyncio
 import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .base import Skill
 
@@ -14,12 +22,307 @@ class MatchResult:
     is_skill_match: bool
 
 
+MatchSignature = Tuple[FrozenSet[str], Tuple[str, ...]]
+
+_EXACT_CACHE_SIZE = 512
+
+
+def _dumps_indented(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+_CLASSIFY_TEMPLATE = """你是一个任务分类器。根据用户的请求，判断应该使用哪个 skill 或 tool 来处理。
+
+用户请求: {query}
+
+可用的 Skills:
+{skills_json}
+
+可用的 Tools:
+{tools_json}
+
+分类规则:
+1. Skills 是复合能力，包含多步骤流程和详细指令
+2. Tools 是原子操作，执行单一功能
+3. 当请求同时匹配 skill 和 tool 时，优先选择 skill
+4. 如果没有匹配的 skill 或 tool，返回 none
+
+请以 JSON 格式返回分类结果:
+{{
+    "type": "skill" | "tool" | "none",
+    "name": "匹配的 skill 或 tool 名称",
+    "confidence": 0.0-1.0,
+    "reasoning": "选择理由"
+}}
+
+只返回 JSON，不要其他内容。"""
+
+
+class _SemanticMatchCache:
+    """按 (skills, tools) 签名分组的语义缓存，余弦相似度达到阈值即命中"""
+    
+    def __init__(
+        self,
+        threshold: float = 0.87,
+        max_entries: int = 256,
+        max_signatures: int = 8,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_signatures = max_signatures
+        self._buckets: "OrderedDict[MatchSignature, OrderedDict[int, Tuple[Any, MatchResult]]]" = OrderedDict()
+        self._matrices: Dict[MatchSignature, Tuple[Any, List[int]]] = {}
+        self._next_id = 0
+    
+    @staticmethod
+    def _normalize(vector):
+        import numpy as np
+        
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+    
+    def lookup(self, signature: MatchSignature, vector) -> Optional[MatchResult]:
+        bucket = self._buckets.get(signature)
+        if not bucket:
+            return None
+        
+        import numpy as np
+        
+        if signature not in self._matrices:
+            ids = list(bucket.keys())
+            self._matrices[signature] = (np.stack([bucket[i][0] for i in ids]), ids)
+        matrix, ids = self._matrices[signature]
+        
+        scores = matrix @ self._normalize(vector)
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+        
+        entry_id = ids[best]
+        bucket.move_to_end(entry_id)
+        self._buckets.move_to_end(signature)
+        return bucket[entry_id][1]
+    
+    def store(self, signature: MatchSignature, vector, result: MatchResult):
+        bucket = self._buckets.get(signature)
+        if bucket is None:
+            bucket = self._buckets[signature] = OrderedDict()
+            if len(self._buckets) > self.max_signatures:
+                old_signature, _ = self._buckets.popitem(last=False)
+                self._matrices.pop(old_signature, None)
+        
+        bucket[self._next_id] = (self._normalize(vector), result)
+        self._next_id += 1
+        if len(bucket) > self.max_entries:
+            bucket.popitem(last=False)
+        self._matrices.pop(signature, None)
+    
+    def clear(self):
+        self._buckets.clear()
+        self._matrices.clear()
+
+
+_EMBEDDING_PRECISIONS = ("float32", "float16", "int8")
+
+
+def _quantize_embeddings(matrix, precision: str):
+    import numpy as np
+    
+    if precision == "float16":
+        return matrix.astype(np.float16), None
+    if precision == "int8":
+        scale = np.abs(matrix).max(axis=1) / 127.0
+        scale[scale == 0] = 1.0
+        quantized = np.round(matrix / scale[:, None]).astype(np.int8)
+        return quantized, scale.astype(np.float32)
+    return matrix.astype(np.float32, copy=False), None
+
+
+def _score_embeddings(quantized, scale, query_vector):
+    import numpy as np
+    
+    query = np.asarray(query_vector, dtype=np.float32)
+    if quantized.dtype == np.int8:
+        query_scale = float(np.abs(query).max()) / 127.0 or 1.0
+        query_q = np.round(query / query_scale).astype(np.int32)
+        return (quantized.astype(np.int32) @ query_q) * scale * query_scale
+    if quantized.dtype == np.float16:
+        return (quantized @ query.astype(np.float16)).astype(np.float32)
+    return quantized @ query
+
+
+class _SkillSnapshot:
+    """某个 skills 快照的派生数据（关键词索引、分类 prompt 中的 skills JSON）"""
+    
+    def __init__(self, skills: List[Skill]):
+        self.key = tuple(map(id, skills))
+        self.skills = list(skills)
+        self._skills_json: Optional[str] = None
+        self.embeddings = None
+        self.tag_entries: List[Tuple[str, str, Skill]] = [
+            (tag_lower, tag, skill)
+            for skill in skills
+            for tag_lower, tag in zip(skill.meta._tags_lower, skill.meta.tags)
+        ]
+        self.tag_rank: Dict[str, int] = {}
+        for rank, (tag_lower, _, _) in enumerate(self.tag_entries):
+            self.tag_rank.setdefault(tag_lower, rank)
+        
+        self.keyword_positions: Dict[str, List[int]] = {}
+        for pos, skill in enumerate(skills):
+            for word in dict.fromkeys(skill.meta._tags_lower + skill.meta._keywords_lower):
+                self.keyword_positions.setdefault(word, []).append(pos)
+        
+        words = sorted((w for w in self.keyword_positions if w), key=len, reverse=True)
+        self._always = frozenset(w for w in self.keyword_positions if not w)
+        self._contained = {w: [k for k in words if k in w] for w in words}
+        self._pattern = (
+            re.compile("(?=(" + "|".join(map(re.escape, words)) + "))")
+            if words else None
+        )
+    
+    @property
+    def skills_json(self) -> str:
+        if self._skills_json is None:
+            self._skills_json = _dumps_indented([
+                {
+                    "name": skill.meta.name,
+                    "description": skill.meta.description,
+                    "tags": skill.meta.tags,
+                }
+                for skill in self.skills
+            ])
+        return self._skills_json
+    
+    def find(self, query_lower: str) -> set:
+        """一次扫描找出 query 中出现的全部关键词（含重叠与互相包含的情况）"""
+        hits = set(self._always)
+        if self._pattern is not None:
+            for longest in set(self._pattern.findall(query_lower)):
+                hits.update(self._contained[longest])
+        return hits
+
+
 class SkillMatcher:
-    def __init__(self, llm=None):
+    def __init__(
+        self,
+        llm=None,
+        embedding_service=None,
+        semantic_threshold: float = 0.87,
+        embedding_precision: str = "float32",
+        embedding_match_threshold: float = 0.6,
+    ):
+        if embedding_precision not in _EMBEDDING_PRECISIONS:
+            raise ValueError(f"embedding_precision must be one of {_EMBEDDING_PRECISIONS}")
+        
         self.llm = llm
+        self.embedding_service = embedding_service
+        self.embedding_precision = embedding_precision
+        self.embedding_match_threshold = embedding_match_threshold
+        self._semantic_cache = _SemanticMatchCache(threshold=semantic_threshold)
+        self._exact_cache: "OrderedDict[Tuple[str, str, MatchSignature], MatchResult]" = OrderedDict()
+        self._snapshot: Optional[_SkillSnapshot] = None
+        self._seen_version: Optional[int] = None
+        self._tools_json: Optional[Tuple[Tuple[str, ...], str]] = None
+        self._tools_lower: Optional[Tuple[Tuple[str, ...], List[Tuple[str, str]]]] = None
     
     def set_llm(self, llm):
         self.llm = llm
+        self._semantic_cache.clear()
+        self._exact_cache.clear()
+    
+    def sync_version(self, version: int):
+        """loader 缓存版本变化时丢弃全部派生缓存（skill 内容可能变了但名字没变）"""
+        if version == self._seen_version:
+            return
+        self._seen_version = version
+        self._snapshot = None
+        self._exact_cache.clear()
+        self._semantic_cache.clear()
+    
+    def set_embedding_service(self, embedding_service):
+        self.embedding_service = embedding_service
+        self._semantic_cache.clear()
+    
+    @staticmethod
+    def _signature(skills: List[Skill], tools: List[str]) -> MatchSignature:
+        return frozenset(s.meta.name for s in skills), tuple(sorted(tools))
+    
+    @staticmethod
+    def _rebind_skill(result: MatchResult, skills: List[Skill]) -> MatchResult:
+        if result.skill is None:
+            return result
+        name = result.skill.meta.name
+        current = next((s for s in skills if s.meta.name == name), None)
+        return replace(result, skill=current)
+    
+    def _get_snapshot(self, skills: List[Skill]) -> _SkillSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.key != tuple(map(id, skills)):
+            snapshot = self._snapshot = _SkillSnapshot(skills)
+        return snapshot
+    
+    def _get_tools_json(self, tools: List[str]) -> str:
+        key = tuple(tools)
+        if self._tools_json is None or self._tools_json[0] != key:
+            self._tools_json = (key, _dumps_indented(tools))
+        return self._tools_json[1]
+    
+    def _get_tools_lower(self, tools: List[str]) -> List[Tuple[str, str]]:
+        key = tuple(tools)
+        if self._tools_lower is None or self._tools_lower[0] != key:
+            self._tools_lower = (key, [(tool.lower(), tool) for tool in tools])
+        return self._tools_lower[1]
+    
+    def _can_embed_skills(self) -> bool:
+        return hasattr(self.embedding_service, "encode_skills")
+    
+    async def _get_skill_embeddings(self, snapshot: _SkillSnapshot):
+        if snapshot.embeddings is None:
+            matrix = await asyncio.to_thread(
+                self.embedding_service.encode_skills, snapshot.skills
+            )
+            snapshot.embeddings = _quantize_embeddings(matrix, self.embedding_precision)
+        return snapshot.embeddings
+    
+    async def warm(self, skills: List[Skill]):
+        """预先构建关键词索引、skills JSON 和 embedding 矩阵，单项失败不影响其他项"""
+        snapshot = await asyncio.to_thread(self._get_snapshot, skills)
+        
+        tasks = [asyncio.to_thread(lambda: snapshot.skills_json)]
+        if self._can_embed_skills():
+            tasks.append(self._get_skill_embeddings(snapshot))
+        
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"Skill matcher warm-up error: {result}")
+    
+    def _exact_get(self, key, skills: List[Skill]) -> Optional[MatchResult]:
+        cached = self._exact_cache.get(key)
+        if cached is None:
+            return None
+        self._exact_cache.move_to_end(key)
+        return self._rebind_skill(cached, skills)
+    
+    def _exact_put(self, key, result: MatchResult):
+        self._exact_cache[key] = result
+        self._exact_cache.move_to_end(key)
+        if len(self._exact_cache) > _EXACT_CACHE_SIZE:
+            self._exact_cache.popitem(last=False)
+    
+    async def _embed_query(self, query: str):
+        if self.embedding_service is None:
+            return None
+        try:
+            return await self.embedding_service.embed_text(query)
+        except Exception as e:
+            print(f"Skill match embedding error: {e}")
+            return None
     
     async def match(
         self,
@@ -36,62 +339,100 @@ class SkillMatcher:
                 is_skill_match=False,
             )
         
-        skill_summaries = []
-        for skill in skills:
-            skill_summaries.append({
-                "name": skill.meta.name,
-                "description": skill.meta.description,
-                "tags": skill.meta.tags,
-            })
+        signature = self._signature(skills, available_tools)
+        exact_key = ("llm", query, signature)
+        cached = self._exact_get(exact_key, skills)
+        if cached is not None:
+            return cached
+        
+        query_vector = await self._embed_query(query)
+        if query_vector is not None:
+            cached = self._semantic_cache.lookup(signature, query_vector)
+            if cached is not None:
+                self._exact_put(exact_key, cached)
+                return self._rebind_skill(cached, skills)
         
-        prompt = self._build_classification_prompt(query, skill_summaries, available_tools)
+        prompt = self._build_classification_prompt(query, skills, available_tools)
         
         try:
             response = await self.llm.ainvoke(prompt)
             
             result = self._parse_classification_response(response.content, skills)
             
+            if result.confidence > 0:
+                self._exact_put(exact_key, result)
+                if query_vector is not None:
+                    self._semantic_cache.store(signature, query_vector, result)
+            
             return result
             
         except Exception as e:
             print(f"LLM classification error: {e}")
             
-            return self._fallback_match(query, skills, available_tools)
+            return await self.match_without_llm(query, skills, available_tools, query_vector)
+    
+    async def match_without_llm(
+        self,
+        query: str,
+        skills: List[Skill],
+        tools: List[str],
+        query_vector=None,
+    ) -> MatchResult:
+        """关键词匹配；没有命中且配置了 embedding 时，按 skill 描述的向量相似度兜底"""
+        result = self._fallback_match(query, skills, tools)
+        if result.confidence > 0 or not self._can_embed_skills():
+            return result
+        
+        try:
+            if query_vector is None:
+                query_vector = await self._embed_query(query)
+            if query_vector is None:
+                return result
+            ranked = await self._rank_by_embedding(query_vector, skills, top_k=1)
+        except Exception as e:
+            print(f"Skill embedding match error: {e}")
+            return result
+        
+        if ranked and ranked[0][1] >= self.embedding_match_threshold:
+            skill, score = ranked[0]
+            return MatchResult(
+                skill=skill,
+                tool_name=None,
+                confidence=score,
+                reasoning="语义相似度匹配",
+                is_skill_match=True,
+            )
+        
+        return result
     
     def _build_classification_prompt(
         self,
         query: str,
-        skills: List[Dict],
+        skills: List[Skill],
         tools: List[str],
     ) -> str:
-        skills_json = json.dumps(skills, ensure_ascii=False, indent=2)
-        tools_json = json.dumps(tools, ensure_ascii=False, indent=2)
+        skills_json = self._get_snapshot(skills).skills_json
+        tools_json = self._get_tools_json(tools)
         
-        return f"""你是一个任务分类器。根据用户的请求，判断应该使用哪个 skill 或 tool 来处理。
-
-用户请求: {query}
-
-可用的 Skills:
-{skills_json}
-
-可用的 Tools:
-{tools_json}
-
-分类规则:
-1. Skills 是复合能力，包含多步骤流程和详细指令
-2. Tools 是原子操作，执行单一功能
-3. 当请求同时匹配 skill 和 tool 时，优先选择 skill
-4. 如果没有匹配的 skill 或 tool，返回 none
-
-请以 JSON 格式返回分类结果:
-{{
-    "type": "skill" | "tool" | "none",
-    "name": "匹配的 skill 或 tool 名称",
-    "confidence": 0.0-1.0,
-    "reasoning": "选择理由"
-}}
-
-只返回 JSON，不要其他内容。"""
+        return _CLASSIFY_TEMPLATE.format_map({
+            "query": query,
+            "skills_json": skills_json,
+            "tools_json": tools_json,
+        })
+    
+    @staticmethod
+    def _extract_json_block(response: str) -> str:
+        start = response.find("```json")
+        if start != -1:
+            start += len("```json")
+        else:
+            start = response.find("```")
+            if start == -1:
+                return response
+            start += len("```")
+        
+        end = response.find("```", start)
+        return response[start:end] if end != -1 else response[start:]
     
     def _parse_classification_response(
         self,
@@ -99,13 +440,7 @@ class SkillMatcher:
         skills: List[Skill],
     ) -> MatchResult:
         try:
-            json_match = response
-            if "```json" in response:
-                json_match = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                json_match = response.split("```")[1].split("```")[0]
-            
-            result = json.loads(json_match.strip())
+            result = _loads(self._extract_json_block(response).strip())
             
             match_type = result.get("type", "none")
             name = result.get("name", "")
@@ -158,22 +493,38 @@ class SkillMatcher:
         query: str,
         skills: List[Skill],
         tools: List[str],
+    ) -> MatchResult:
+        exact_key = ("fallback", query, self._signature(skills, tools))
+        cached = self._exact_get(exact_key, skills)
+        if cached is not None:
+            return cached
+        
+        result = self._keyword_fallback(query, skills, tools)
+        self._exact_put(exact_key, result)
+        return result
+    
+    def _keyword_fallback(
+        self,
+        query: str,
+        skills: List[Skill],
+        tools: List[str],
     ) -> MatchResult:
         query_lower = query.lower()
         
-        for skill in skills:
-            for tag in skill.meta.tags:
-                if tag.lower() in query_lower:
-                    return MatchResult(
-                        skill=skill,
-                        tool_name=None,
-                        confidence=0.6,
-                        reasoning=f"关键词匹配: {tag}",
-                        is_skill_match=True,
-                    )
-        
-        for tool in tools:
-            if tool.lower() in query_lower:
+        snapshot = self._get_snapshot(skills)
+        ranks = [snapshot.tag_rank[w] for w in snapshot.find(query_lower) if w in snapshot.tag_rank]
+        if ranks:
+            _, tag, skill = snapshot.tag_entries[min(ranks)]
+            return MatchResult(
+                skill=skill,
+                tool_name=None,
+                confidence=0.6,
+                reasoning=f"关键词匹配: {tag}",
+                is_skill_match=True,
+            )
+        
+        for tool_lower, tool in self._get_tools_lower(tools):
+            if tool_lower in query_lower:
                 return MatchResult(
                     skill=None,
                     tool_name=tool,
@@ -191,19 +542,39 @@ class SkillMatcher:
         )
     
     def match_by_keywords(self, query: str, skills: List[Skill]) -> List[Skill]:
-        matched = []
-        query_lower = query.lower()
+        snapshot = self._get_snapshot(skills)
+        hits = set()
+        for word in snapshot.find(query.lower()):
+            hits.update(snapshot.keyword_positions[word])
         
-        for skill in skills:
-            for tag in skill.meta.tags:
-                if tag.lower() in query_lower:
-                    matched.append(skill)
-                    break
-            
-            keywords = skill.meta.matching.get("keywords", [])
-            for kw in keywords:
-                if kw.lower() in query_lower:
-                    matched.append(skill)
-                    break
+        return [snapshot.skills[pos] for pos in sorted(hits)]
+    
+    async def match_by_embedding(
+        self,
+        query: str,
+        skills: List[Skill],
+        top_k: int = 3,
+    ) -> List[Tuple[Skill, float]]:
+        if not skills or not self._can_embed_skills():
+            return []
+        
+        query_vector = await self._embed_query(query)
+        if query_vector is None:
+            return []
+        
+        return await self._rank_by_embedding(query_vector, skills, top_k)
+    
+    async def _rank_by_embedding(
+        self,
+        query_vector,
+        skills: List[Skill],
+        top_k: int,
+    ) -> List[Tuple[Skill, float]]:
+        import numpy as np
+        
+        snapshot = self._get_snapshot(skills)
+        quantized, scale = await self._get_skill_embeddings(snapshot)
+        scores = _score_embeddings(quantized, scale, query_vector)
+        top = np.argsort(-scores)[:top_k]
         
-        return matched
+        return [(snapshot.skills[i], float(scores[i])) for i in top]
@@ -2,29 +2,60 @@
 Skills 追踪模块
 追踪 skills 的加载、匹配、激活和 prompt 注入过程
 """
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 import json
 import logging
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
 
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+def _format_ns(timestamp_ns: int) -> str:
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+
+def _json_head(obj: Any, limit: int) -> str:
+    """增量编码 JSON，超过 limit 个字符后立即停止，不生成完整字符串"""
+    parts = []
+    size = 0
+    for chunk in _JSON_ENCODER.iterencode(obj):
+        parts.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return "".join(parts)[:limit] + "..."
+    return "".join(parts)
+
+
 @dataclass
 class SkillTraceStep:
     """单个追踪步骤"""
     step_name: str
     step_type: str
     data: Dict[str, Any]
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: int = field(default_factory=time.time_ns)
+    started_at: Optional[int] = None
     
     def to_dict(self) -> dict:
+        data = self.data
+        if self.started_at is not None:
+            data = {
+                **data,
+                "_start_time": _format_ns(self.started_at),
+                "_end_time": _format_ns(self.timestamp),
+            }
+        
         return {
             "step_name": self.step_name,
             "step_type": self.step_type,
-            "data": self.data,
-            "timestamp": self.timestamp.isoformat(),
+            "data": data,
+            "timestamp": _format_ns(self.timestamp),
         }
 
 
@@ -32,9 +63,15 @@ class SkillTracer:
     """Skills 追踪器"""
     
     def __init__(self):
-        self._steps: List[SkillTraceStep] = []
         self._enabled: bool = True
+        self._sample_rate: float = 1.0
         self._max_steps: int = 100
+        self._steps: Deque[SkillTraceStep] = deque(maxlen=self._max_steps)
+    
+    @property
+    def enabled(self) -> bool:
+        """是否启用追踪，热路径可据此跳过 data 的构造"""
+        return self._enabled
     
     def enable(self):
         """启用追踪"""
@@ -44,6 +81,10 @@ class SkillTracer:
         """禁用追踪"""
         self._enabled = False
     
+    def set_sample_rate(self, rate: float):
+        """设置采样率 (0.0-1.0)，1.0 表示记录全部步骤"""
+        self._sample_rate = min(max(rate, 0.0), 1.0)
+    
     def clear(self):
         """清空追踪记录"""
         self._steps.clear()
@@ -53,6 +94,7 @@ class SkillTracer:
         step_name: str,
         step_type: str,
         data: Dict[str, Any],
+        started_at: Optional[int] = None,
     ):
         """
         记录追踪步骤
@@ -61,29 +103,31 @@ class SkillTracer:
             step_name: 步骤名称
             step_type: 步骤类型 (loader, matcher, manager, prompt, tool)
             data: 追踪数据
+            started_at: 步骤开始时间 (time.time_ns)，仅由上下文管理器传入
         """
         if not self._enabled:
             return
         
+        if self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            return
+        
         step = SkillTraceStep(
             step_name=step_name,
             step_type=step_type,
             data=data,
+            started_at=started_at,
         )
         
         self._steps.append(step)
         
-        if len(self._steps) > self._max_steps:
-            self._steps = self._steps[-self._max_steps:]
-        
         self._log_step(step)
     
     def _log_step(self, step: SkillTraceStep):
         """输出日志"""
-        data_str = json.dumps(step.data, ensure_ascii=False, default=str)
-        if len(data_str) > 200:
-            data_str = data_str[:200] + "..."
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
+        data_str = _json_head(step.data, 200)
         logger.info(f"[Skill:{step.step_type.upper()}] {step.step_name} | {data_str}")
     
     def get_steps(self) -> List[Dict]:
@@ -111,10 +155,7 @@ class SkillTracer:
                 current_type = step.step_type
                 lines.append(f"\n[{current_type.upper()}]")
             
-            data_str = json.dumps(step.data, ensure_ascii=False, default=str)
-            if len(data_str) > 100:
-                data_str = data_str[:100] + "..."
-            
+            data_str = _json_head(step.data, 100)
             lines.append(f"  {step.step_name}: {data_str}")
         
         lines.append("\n" + "=" * 60)
@@ -122,14 +163,13 @@ class SkillTracer:
     
     def get_stats(self) -> Dict:
         """获取统计信息"""
-        type_counts = {}
-        for step in self._steps:
-            type_counts[step.step_type] = type_counts.get(step.step_type, 0) + 1
+        type_counts = dict(Counter(step.step_type for step in self._steps))
         
         return {
             "total_steps": len(self._steps),
             "by_type": type_counts,
             "enabled": self._enabled,
+            "sample_rate": self._sample_rate,
         }
 
 
@@ -148,10 +188,29 @@ def skill_trace_step(step_name: str, step_type: str, data: Dict[str, Any]):
     用法:
         with skill_trace_step("match", "matcher", {"query": query}):
             # ... 代码 ...
+    
+    追踪禁用时返回空上下文，不计时也不修改 data
     """
+    if not _skill_tracer._enabled:
+        return _NOOP_CONTEXT
     return SkillTraceContext(step_name, step_type, data)
 
 
+class _NoopTraceContext:
+    """追踪禁用时使用的空上下文管理器"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NOOP_CONTEXT = _NoopTraceContext()
+
+
 class SkillTraceContext:
     """追踪上下文管理器"""
     
@@ -164,23 +223,21 @@ class SkillTraceContext:
         self.step_name = step_name
         self.step_type = step_type
         self.data = data
-        self._start_time = None
+        self._started_at: Optional[int] = None
+        self._start_ns: Optional[int] = None
     
     def __enter__(self):
-        self._start_time = datetime.now()
-        self.data["_start_time"] = self._start_time.isoformat()
+        self._started_at = time.time_ns()
+        self._start_ns = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        end_time = datetime.now()
-        self.data["_end_time"] = end_time.isoformat()
-        
-        if self._start_time:
-            duration = (end_time - self._start_time).total_seconds()
-            self.data["_duration_ms"] = round(duration * 1000, 2)
+        if self._start_ns is not None:
+            duration_ns = time.perf_counter_ns() - self._start_ns
+            self.data["_duration_ms"] = round(duration_ns / 1e6, 2)
         
         if exc_type:
             self.data["_error"] = str(exc_val)
         
-        _skill_tracer.trace(self.step_name, self.step_type, self.data)
+        _skill_tracer.trace(self.step_name, self.step_type, self.data, self._started_at)
         return False